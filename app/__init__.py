@@ -3,24 +3,40 @@ from flask import Flask
 from flask_bcrypt import Bcrypt
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from flasgger import Swagger
 from sqlalchemy.orm import DeclarativeBase
+from app.cache import ReportCache
+from app.hashing import PasswordHasher
+from app.replica import RoutingSession
 
 class Base(DeclarativeBase):
     pass
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
 migrate = Migrate() 
 bcrypt = Bcrypt()
+password_hasher = PasswordHasher()
+report_cache = ReportCache()
 
 def create_app(config_name="config"):
     app = Flask(__name__)
     app.config.from_object(config_name)  
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
     db.init_app(app)
     migrate.init_app(app, db)
+    report_cache.init_app(app)
     
     with app.app_context():
+        from app import engine
+        for bind_engine in db.engines.values():
+            engine.init_app(app, bind_engine)
+        from app import instrumentation
+        instrumentation.init_app(app, db.engines.values())
+        from app import metrics
+        metrics.init_app(app, db.engines.values(), report_cache)
+        from app import replica
+        replica.init_app(app, report_cache)
+
         from .view import main_bp 
         app.register_blueprint(main_bp)
         
@@ -35,7 +51,14 @@ def create_app(config_name="config"):
         from app.categories.models import Category
         from app.categories import categories_bp
         app.register_blueprint(categories_bp, url_prefix="/api")
+
+        from app import profiling
+        profiling.init_app(app)
         
-        Swagger(app)
+        from app.seed import seed_command
+        app.cli.add_command(seed_command)
+
+        from app.openapi import docs_bp
+        app.register_blueprint(docs_bp)
     return app
 
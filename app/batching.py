@@ -0,0 +1,7 @@
+BULK_INSERT_BATCH_SIZE = 5000
+
+
+def batches(rows, size=BULK_INSERT_BATCH_SIZE):
+    """Consecutive slices of at most `size` rows, for executemany inserts and IN lists."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
@@ -0,0 +1,281 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+ALL_USERS = None
+ALL_MONTHS = None
+
+
+def _scopes(user_id, month):
+    return ["*", f"u:{user_id}", f"u:{user_id}:{month}"]
+
+
+def _data_versions(tags):
+    """The shared data_versions counters of the tagged users and of the categories.
+
+    Every write that changes a report bumps one of them, whichever worker made it.
+    """
+    from app import versions
+    user_ids = sorted({user_id for user_id, _ in tags})
+    return tuple(versions.current([versions.CATEGORIES] + [versions.user_scope(user_id) for user_id in user_ids]))
+
+
+class NullBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, tags, versions=()):
+        return 0
+
+    def versions(self, tags):
+        return ()
+
+    def invalidate(self, user_id, month):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+class MemoryBackend:
+    """Per-process LRU. Writes made by other workers don't reach it, so each
+    entry keeps the versions it was computed at and is a miss once they moved;
+    the recomputed value then replaces it."""
+
+    def __init__(self, max_entries, shared_versions=lambda tags: ()):
+        self.max_entries = max_entries
+        self.shared_versions = shared_versions
+        self.entries = OrderedDict()
+        self.tags = {}
+        self.scope_versions = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, tags, versions = entry
+        if self.versions(tags) != versions:
+            return None
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, tags, versions=()):
+        evicted = 0
+        with self.lock:
+            self.entries[key] = (value, tags, versions)
+            self.entries.move_to_end(key)
+            for tag in tags:
+                self.tags.setdefault(tag, set()).add(key)
+            while len(self.entries) > self.max_entries:
+                old_key, (_, old_tags, _) = self.entries.popitem(last=False)
+                self._untag(old_key, old_tags)
+                evicted += 1
+        return evicted
+
+    def _untag(self, key, tags):
+        for tag in tags:
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+
+    def versions(self, tags):
+        with self.lock:
+            local = tuple(
+                self.scope_versions.get(scope, 0)
+                for user_id, month in tags
+                for scope in _scopes(user_id, month)
+            )
+        return local + self.shared_versions(tags)
+
+    def invalidate(self, user_id, month):
+        with self.lock:
+            if user_id is ALL_USERS:
+                scope = "*"
+                tags = list(self.tags)
+            elif month is ALL_MONTHS:
+                scope = f"u:{user_id}"
+                tags = [tag for tag in self.tags if tag[0] == user_id]
+            else:
+                scope = f"u:{user_id}:{month}"
+                tags = [(user_id, month)]
+            self.scope_versions[scope] = self.scope_versions.get(scope, 0) + 1
+            for tag in tags:
+                for key in self.tags.pop(tag, ()):
+                    entry = self.entries.pop(key, None)
+                    if entry is not None:
+                        self._untag(key, entry[1])
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SqliteBackend:
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self.local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._connection()
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL);
+                CREATE INDEX IF NOT EXISTS ix_entries_last_used ON entries (last_used);
+                CREATE TABLE IF NOT EXISTS entry_tags (user_id INTEGER, month TEXT, key TEXT NOT NULL);
+                CREATE INDEX IF NOT EXISTS ix_entry_tags_user_month ON entry_tags (user_id, month);
+                CREATE INDEX IF NOT EXISTS ix_entry_tags_key ON entry_tags (key);
+                CREATE TABLE IF NOT EXISTS scope_versions (scope TEXT PRIMARY KEY, version INTEGER NOT NULL);
+            """)
+
+    def _connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self.local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connection()
+        row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def set(self, key, value, tags, versions=()):
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+            conn.execute("DELETE FROM entry_tags WHERE key = ?", (key,))
+            conn.executemany(
+                "INSERT INTO entry_tags (user_id, month, key) VALUES (?, ?, ?)",
+                [(user_id, month, key) for user_id, month in tags]
+            )
+            overflow = conn.execute("SELECT count(*) FROM entries").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                stale = [row[0] for row in conn.execute(
+                    "SELECT key FROM entries ORDER BY last_used LIMIT ?", (overflow,)
+                )]
+                self._delete_keys(conn, stale)
+                return len(stale)
+        return 0
+
+    def _delete_keys(self, conn, keys):
+        conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in keys])
+        conn.executemany("DELETE FROM entry_tags WHERE key = ?", [(k,) for k in keys])
+
+    def versions(self, tags):
+        scopes = [scope for user_id, month in tags for scope in _scopes(user_id, month)]
+        if not scopes:
+            return ()
+        placeholders = ",".join("?" * len(scopes))
+        found = dict(self._connection().execute(
+            f"SELECT scope, version FROM scope_versions WHERE scope IN ({placeholders})", scopes
+        ).fetchall())
+        return tuple(found.get(scope, 0) for scope in scopes)
+
+    def invalidate(self, user_id, month):
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if user_id is ALL_USERS:
+                scope = "*"
+                conn.execute("DELETE FROM entries")
+                conn.execute("DELETE FROM entry_tags")
+            else:
+                if month is ALL_MONTHS:
+                    scope = f"u:{user_id}"
+                    keys = conn.execute("SELECT key FROM entry_tags WHERE user_id = ?", (user_id,)).fetchall()
+                else:
+                    scope = f"u:{user_id}:{month}"
+                    keys = conn.execute(
+                        "SELECT key FROM entry_tags WHERE user_id = ? AND month = ?", (user_id, month)
+                    ).fetchall()
+                self._delete_keys(conn, {row[0] for row in keys})
+            conn.execute(
+                "INSERT INTO scope_versions (scope, version) VALUES (?, 1) "
+                "ON CONFLICT (scope) DO UPDATE SET version = version + 1",
+                (scope,)
+            )
+
+    def __len__(self):
+        return self._connection().execute("SELECT count(*) FROM entries").fetchone()[0]
+
+
+class ReportCache:
+    def __init__(self, app=None):
+        self.backend = NullBackend()
+        self.backend_name = "none"
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.observers = []
+        self.store_checks = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.backend_name = app.config.get("REPORT_CACHE_BACKEND", "memory")
+        max_entries = app.config.get("REPORT_CACHE_MAX_ENTRIES", 1024)
+        if self.backend_name == "memory":
+            self.backend = MemoryBackend(max_entries, _data_versions)
+        elif self.backend_name == "sqlite":
+            path = app.config.get("REPORT_CACHE_PATH") or os.path.join(app.instance_path, "report_cache.sqlite")
+            self.backend = SqliteBackend(path, max_entries)
+        elif self.backend_name == "none":
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f"Unknown REPORT_CACHE_BACKEND: {self.backend_name!r}")
+        app.extensions["report_cache"] = self
+
+    def _count(self, hits=0, misses=0, evictions=0):
+        with self.lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+        for observer in self.observers:
+            observer(hits, misses, evictions)
+
+    def get_or_compute(self, key, tags, compute):
+        key = json.dumps(key, separators=(",", ":"))
+        value = self.backend.get(key)
+        if value is not None:
+            self._count(hits=1)
+            return value
+
+        self._count(misses=1)
+        before = self.backend.versions(tags)
+        value = compute()
+        if self.backend.versions(tags) == before and all(check() for check in self.store_checks):
+            self._count(evictions=self.backend.set(key, value, tags, before))
+        return value
+
+    def invalidate(self, user_id=ALL_USERS, month=ALL_MONTHS):
+        self.backend.invalidate(user_id, month)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend_name,
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
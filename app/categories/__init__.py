@@ -1,4 +1,4 @@
 from flask import Blueprint
 
 categories_bp = Blueprint("categories", __name__)
-from . import view
\ No newline at end of file
+from . import view, cache
\ No newline at end of file
@@ -0,0 +1,62 @@
+import threading
+from flask import current_app, g, has_request_context
+from sqlalchemy.orm import make_transient_to_detached
+from app import db, versions
+from app.categories.models import Category
+from app.categories import categories_bp
+
+
+class CategoryCache:
+    """Every category of one database, reloaded when its version counter moves.
+
+    The counter is the "categories" row of data_versions, bumped by the
+    category handlers in any worker, and is read at most once per request.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.ids_by_name = {}
+        self.categories = []
+
+    def _refresh(self):
+        if has_request_context() and g.get("category_cache_checked"):
+            return
+        version = versions.current([versions.CATEGORIES])[0]
+        with self.lock:
+            if version != self.version:
+                rows = db.session.query(Category.id, Category.name).order_by(Category.id).all()
+                self.ids_by_name = {name: category_id for category_id, name in rows}
+                self.categories = [{"id": category_id, "name": name} for category_id, name in rows]
+                self.version = version
+        if has_request_context():
+            g.category_cache_checked = True
+
+    def ids_for(self, names):
+        self._refresh()
+        ids_by_name = self.ids_by_name
+        return {name: ids_by_name[name] for name in names if isinstance(name, str) and name in ids_by_name}
+
+    def all(self):
+        self._refresh()
+        return self.categories
+
+
+@categories_bp.record_once
+def _create_cache(state):
+    state.app.extensions["category_cache"] = CategoryCache()
+
+
+def category_cache():
+    return current_app.extensions["category_cache"]
+
+
+def resolve(names):
+    """Session-attached Category objects for the known names, without a query."""
+    categories = []
+    for name, category_id in category_cache().ids_for(names).items():
+        category = Category(name=name)
+        category.id = category_id
+        make_transient_to_detached(category)
+        categories.append(db.session.merge(category, load=False))
+    return categories
@@ -3,7 +3,8 @@ from app import db
 transaction_categories = db.Table(
     "transaction_categories",
     db.Column("transaction_id", db.Integer, db.ForeignKey("transactions.id"), primary_key=True),
-    db.Column("category_id", db.Integer, db.ForeignKey("categories.id"), primary_key=True)
+    db.Column("category_id", db.Integer, db.ForeignKey("categories.id"), primary_key=True),
+    db.Index("ix_transaction_categories_category_id", "category_id", "transaction_id")
 )
 
 class Category(db.Model):
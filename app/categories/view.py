@@ -1,8 +1,13 @@
 from flask import Blueprint, request, jsonify
-from flasgger import swag_from
+from app.openapi import swag_from
 from app import db
+from app.replica import reads_from_replica
+from app import versions
 from app.categories.models import Category 
-from app.categories import categories_bp
+from app.categories import categories_bp, cache
+from app.pagination import InvalidPageParams, parse_fields
+
+CATEGORY_FIELDS = ["id", "name"]
 
 @categories_bp.route("/categories", methods=["POST"])
 @swag_from({
@@ -28,6 +33,7 @@ def create_category():
 
     category = Category(name=name)
     db.session.add(category)
+    versions.bump(versions.CATEGORIES)
     db.session.commit()
 
     return jsonify({"message": "Category created!", "category": category.to_dict()}), 201
@@ -37,11 +43,24 @@ def create_category():
 @swag_from({
     "tags": ["Categories"],
     "summary": "Get all categories",
-    "responses": {"200": {"description": "List of categories"}}
+    "parameters": [
+        {"name": "fields", "in": "query", "required": False, "type": "string", "description": "Comma-separated subset of id, name (default: all)", "example": "name"}
+    ],
+    "responses": {
+        "200": {"description": "List of categories"},
+        "400": {"description": "Unknown field"}
+    }
 })
+@versions.conditional(versions.CATEGORIES)
 def get_categories():
-    categories = Category.query.all()
-    return jsonify([category.to_dict() for category in categories])
+    try:
+        fields = parse_fields(request.args.get("fields"), CATEGORY_FIELDS)
+    except InvalidPageParams as e:
+        return jsonify({"message": str(e)}), 400
+    categories = cache.category_cache().all()
+    if len(fields) == len(CATEGORY_FIELDS):
+        return jsonify(categories)
+    return jsonify([{field: category[field] for field in fields} for category in categories])
 
 
 @categories_bp.route("/categories/<int:category_id>", methods=["GET"])
@@ -61,6 +80,8 @@ def get_categories():
         "404": {"description": "Category not found"}
     }
 })
+@reads_from_replica
+@versions.conditional(versions.CATEGORIES)
 def get_category_by_id(category_id):
     category = Category.query.get(category_id)
     
@@ -85,8 +106,13 @@ def update_category(category_id):
         return jsonify({"message": "Category not found"}), 404
 
     data = request.get_json()
+    if data.get("name", category.name) != category.name:
+        from app.transactions import rollups
+        rollups.invalidate_reports()
+        versions.bump(versions.TRANSACTIONS)
     category.name = data.get("name", category.name)
 
+    versions.bump(versions.CATEGORIES)
     db.session.commit()
     return jsonify({"message": "Category updated!", "category": category.to_dict()})
 
@@ -103,6 +129,9 @@ def delete_category(category_id):
     if not category:
         return jsonify({"message": "Category not found"}), 404
 
+    from app.transactions import rollups
+    rollups.forget_category(category.id)
+    versions.bump(versions.CATEGORIES, versions.TRANSACTIONS)
     db.session.delete(category)
     db.session.commit()
     return jsonify({"message": "Category deleted!"})
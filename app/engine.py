@@ -0,0 +1,22 @@
+from sqlalchemy import event
+
+
+def _apply_pragmas(pragmas, dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def init_app(app, engine):
+    # The rollups, timeseries, search and bulk inserts rely on SQLite.
+    if engine.dialect.name != "sqlite":
+        raise ValueError(f"Unsupported database {engine.url.render_as_string()!r}: only SQLite is supported")
+    app.config.setdefault("SQLITE_PRAGMAS", {})
+    pragmas = dict(app.config["SQLITE_PRAGMAS"])
+    if not pragmas:
+        return
+
+    event.listen(engine, "connect", lambda dbapi_connection, record: _apply_pragmas(pragmas, dbapi_connection))
@@ -0,0 +1,140 @@
+import hmac
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from flask import jsonify
+
+
+class HashingBusy(Exception):
+    """Raised instead of queueing when the hashing pool is saturated."""
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(password_hash, password, rounds):
+    try:
+        matches = bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+    except ValueError:
+        # Not a bcrypt hash: a legacy row holding the raw password. Replace it on a match.
+        if hmac.compare_digest(password_hash.encode("utf-8"), password.encode("utf-8")):
+            return True, _hash(password, rounds)
+        return False, None
+    if not matches:
+        return False, None
+    if hash_rounds(password_hash) != rounds:
+        return True, _hash(password, rounds)
+    return True, None
+
+
+def hash_rounds(password_hash):
+    try:
+        return int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """bcrypt on a small process pool, so hashing can't take over the request workers.
+
+    At most PASSWORD_HASH_MAX_PENDING hashes per worker process are running
+    or queued; beyond that `HashingBusy` is raised and answered with a 503.
+    """
+
+    def __init__(self, app=None):
+        self.executor = None
+        self.bulk_executor = None
+        self.lock = threading.Lock()
+        self.bulk_slot = threading.Lock()
+        self.rounds = 12
+        self.workers = 2
+        self.bulk_workers = os.cpu_count() or 1
+        self.timeout = 10
+        self.slots = threading.BoundedSemaphore(16)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get("BCRYPT_LOG_ROUNDS", 12)
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", 2)
+        self.bulk_workers = app.config.get("PASSWORD_HASH_BULK_WORKERS") or os.cpu_count() or 1
+        self.timeout = app.config.get("PASSWORD_HASH_TIMEOUT_SECONDS", 10)
+        self.slots = threading.BoundedSemaphore(app.config.get("PASSWORD_HASH_MAX_PENDING", 16))
+        app.register_error_handler(HashingBusy, _busy_response)
+        app.extensions["password_hasher"] = self
+
+    def _get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                # Spawned, not forked: the request worker may already be running threads.
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self.executor
+
+    def _get_bulk_executor(self):
+        with self.lock:
+            if self.bulk_executor is None:
+                self.bulk_executor = ProcessPoolExecutor(
+                    max_workers=self.bulk_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self.bulk_executor
+
+    def _run(self, function, *args):
+        slots = self.slots
+        if not slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            future = self._get_executor().submit(function, *args)
+        except BaseException:
+            slots.release()
+            raise
+        # The slot is held until the hash finishes, not until we stop waiting,
+        # so timed-out hashes still count against PASSWORD_HASH_MAX_PENDING.
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingBusy()
+        except BrokenProcessPool:
+            with self.lock:
+                self.executor = None
+            raise
+
+    def hash(self, password):
+        return self._run(_hash, password, self.rounds)
+
+    def hash_many(self, passwords):
+        """Hash a batch on a separate pool sized to the CPU count.
+
+        Single-user hashes keep their own pool, so an import can't starve
+        signups. One batch runs at a time per process; others get HashingBusy.
+        """
+        if not self.bulk_slot.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            executor = self._get_bulk_executor()
+            chunksize = max(1, len(passwords) // (self.bulk_workers * 4))
+            return list(executor.map(_hash, passwords, itertools.repeat(self.rounds), chunksize=chunksize))
+        except BrokenProcessPool:
+            with self.lock:
+                self.bulk_executor = None
+            raise
+        finally:
+            self.bulk_slot.release()
+
+    def verify(self, password_hash, password):
+        """Return (matches, new_hash). new_hash is set when the cost factor changed."""
+        return self._run(_verify, password_hash, password, self.rounds)
+
+
+def _busy_response(error):
+    response = jsonify({"message": "Server is busy hashing passwords, try again shortly"})
+    response.status_code = 503
+    response.headers["Retry-After"] = "1"
+    return response
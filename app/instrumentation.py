@@ -0,0 +1,127 @@
+import heapq
+import json
+import logging
+import time
+from flask import g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+slow_log = logging.getLogger("app.slow")
+
+SLOWEST_QUERIES_KEPT = 5
+MAX_LOGGED_SQL = 2000
+MAX_LOGGED_PARAMS = 500
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            if has_request_context() and "request_started" in g:
+                g.serialize_time += time.perf_counter() - started
+
+
+def _shorten(value, limit):
+    text = value if isinstance(value, str) else repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _query_record(app, duration, statement, parameters):
+    record = {
+        "duration_ms": round(duration * 1000, 3),
+        "sql": _shorten(statement, MAX_LOGGED_SQL)
+    }
+    if app.config["SLOW_LOG_PARAMS"]:
+        record["params"] = _shorten(parameters, MAX_LOGGED_PARAMS)
+    return record
+
+
+def _log(event_name, **fields):
+    slow_log.warning(json.dumps({"event": event_name, **fields}, default=str))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None:
+        started = exception_context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+
+def _after_cursor_execute(app, conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_started"].pop()
+    endpoint = None
+    if has_request_context() and "request_started" in g:
+        endpoint = request.endpoint
+        g.db_time += duration
+        g.db_statements += 1
+        entry = (duration, g.db_statements, statement, parameters)
+        if len(g.slowest_queries) < SLOWEST_QUERIES_KEPT:
+            heapq.heappush(g.slowest_queries, entry)
+        elif duration > g.slowest_queries[0][0]:
+            heapq.heapreplace(g.slowest_queries, entry)
+
+    if duration * 1000 >= app.config["SLOW_QUERY_MS"]:
+        _log("slow_query", endpoint=endpoint, **_query_record(app, duration, statement, parameters))
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.db_time = 0.0
+    g.db_statements = 0
+    g.serialize_time = 0.0
+    g.slowest_queries = []
+
+
+def _finish_request(app, response):
+    if "request_started" not in g:
+        return response
+    total = time.perf_counter() - g.request_started
+    response.headers["Server-Timing"] = (
+        f'db;dur={g.db_time * 1000:.2f};desc="{g.db_statements} queries", '
+        f"serialize;dur={g.serialize_time * 1000:.2f}, "
+        f"total;dur={total * 1000:.2f}"
+    )
+
+    if total * 1000 >= app.config["SLOW_REQUEST_MS"]:
+        _log(
+            "slow_request",
+            endpoint=request.endpoint,
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            total_ms=round(total * 1000, 3),
+            db_ms=round(g.db_time * 1000, 3),
+            serialize_ms=round(g.serialize_time * 1000, 3),
+            statements=g.db_statements,
+            slowest_queries=[
+                _query_record(app, duration, statement, parameters)
+                for duration, _, statement, parameters in sorted(g.slowest_queries, reverse=True)
+            ]
+        )
+    return response
+
+
+def init_app(app, engines):
+    app.config.setdefault("SQL_INSTRUMENTATION", True)
+    app.config.setdefault("SLOW_REQUEST_MS", 500)
+    app.config.setdefault("SLOW_QUERY_MS", 100)
+    app.config.setdefault("SLOW_LOG_PARAMS", False)
+    if not app.config["SQL_INSTRUMENTATION"]:
+        return
+
+    app.json = TimedJSONProvider(app)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+        event.listen(
+            engine, "after_cursor_execute",
+            lambda *args: _after_cursor_execute(app, *args)
+        )
+    app.before_request(_start_request)
+    app.after_request(lambda response: _finish_request(app, response))
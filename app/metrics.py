@@ -0,0 +1,106 @@
+import os
+import time
+from flask import g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by endpoint, method and status code",
+    ["endpoint", "method", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time spent handling a request",
+    ["endpoint", "method"]
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being handled",
+    multiprocess_mode="livesum"
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a database connection from the pool",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum"
+)
+REPORT_CACHE = Counter(
+    "report_cache_events_total", "Report cache lookups and evictions",
+    ["result"]
+)
+
+
+def _endpoint():
+    return request.endpoint or "unmatched"
+
+
+def _start_request():
+    g.metrics_started = time.perf_counter()
+    IN_FLIGHT.inc()
+
+
+def _record_response(response):
+    if "metrics_started" in g:
+        g.metrics_status = response.status_code
+    return response
+
+
+def _finish_request(exception):
+    if "metrics_started" not in g:
+        return
+    IN_FLIGHT.dec()
+    endpoint = _endpoint()
+    status = g.get("metrics_status", 500)
+    REQUESTS.labels(endpoint, request.method, str(status)).inc()
+    REQUEST_LATENCY.labels(endpoint, request.method).observe(time.perf_counter() - g.metrics_started)
+
+
+def _instrument_pool(engine):
+    pool = engine.pool
+    do_get = pool._do_get
+
+    def timed_do_get():
+        started = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+    pool._do_get = timed_do_get
+
+
+def _count_cache(hits, misses, evictions):
+    if hits:
+        REPORT_CACHE.labels("hit").inc(hits)
+    if misses:
+        REPORT_CACHE.labels("miss").inc(misses)
+    if evictions:
+        REPORT_CACHE.labels("eviction").inc(evictions)
+
+
+def render():
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def init_app(app, engines, report_cache):
+    app.config.setdefault("METRICS_ENABLED", True)
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    from sqlalchemy import event
+    for engine in engines:
+        event.listen(engine, "checkout", lambda *args: POOL_CHECKED_OUT.inc())
+        event.listen(engine, "checkin", lambda *args: POOL_CHECKED_OUT.dec())
+        _instrument_pool(engine)
+    if _count_cache not in report_cache.observers:
+        report_cache.observers.append(_count_cache)
+
+    app.before_request(_start_request)
+    app.after_request(_record_response)
+    app.teardown_request(_finish_request)
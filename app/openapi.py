@@ -0,0 +1,104 @@
+import importlib.util
+import json
+import os
+import sys
+import click
+from flask import Blueprint, current_app, send_file, send_from_directory
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "openapi.json")
+SPEC_URL = "/apispec_1.json"
+
+docs_bp = Blueprint("docs", __name__, cli_group="openapi")
+
+DOCS_PAGE = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8">
+    <title>API docs</title>
+    <link rel="stylesheet" type="text/css" href="/flasgger_static/swagger-ui.css">
+    <link rel="icon" type="image/png" href="/flasgger_static/favicon-32x32.png" sizes="32x32">
+  </head>
+  <body>
+    <div id="swagger-ui"></div>
+    <script src="/flasgger_static/swagger-ui-bundle.js"></script>
+    <script src="/flasgger_static/swagger-ui-standalone-preset.js"></script>
+    <script>
+      window.onload = function() {
+        window.ui = SwaggerUIBundle({
+          url: "%s",
+          dom_id: "#swagger-ui",
+          validatorUrl: null,
+          deepLinking: true,
+          presets: [SwaggerUIBundle.presets.apis, SwaggerUIStandalonePreset],
+          plugins: [SwaggerUIBundle.plugins.DownloadUrl],
+          layout: "StandaloneLayout"
+        });
+      };
+    </script>
+  </body>
+</html>
+""" % SPEC_URL
+
+
+def swag_from(specs):
+    """Attach an OpenAPI operation dict to a view.
+
+    Stores it where flasgger looks for it, without importing flasgger, so the
+    spec can be built with `flask openapi build` but costs nothing at runtime.
+    """
+    def decorator(function):
+        function.specs_dict = specs
+        return function
+
+    return decorator
+
+
+def _swagger_ui_static():
+    spec = importlib.util.find_spec("flasgger")
+    return os.path.join(spec.submodule_search_locations[0], "ui3", "static")
+
+
+@docs_bp.route("/apidocs/")
+def apidocs():
+    return DOCS_PAGE
+
+
+@docs_bp.route("/flasgger_static/<path:filename>")
+def swagger_ui_static(filename):
+    return send_from_directory(_swagger_ui_static(), filename, max_age=86400)
+
+
+@docs_bp.route(SPEC_URL)
+def apispec():
+    return send_file(SPEC_PATH, mimetype="application/json")
+
+
+def build_spec(app):
+    from flasgger import Swagger
+
+    swagger = Swagger(app)
+    with app.test_request_context():
+        return swagger.get_apispecs("apispec_1")
+
+
+@docs_bp.cli.command("build")
+@click.option("--check", is_flag=True, help="Fail if the committed spec is out of date instead of writing it.")
+def build_command(check):
+    """Generate app/static/openapi.json from the views' swag_from specs."""
+    spec = json.dumps(build_spec(current_app), indent=2, sort_keys=True) + "\n"
+    if check:
+        try:
+            with open(SPEC_PATH) as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+        if current != spec:
+            click.echo(f"{SPEC_PATH} is out of date, run `flask openapi build`.", err=True)
+            sys.exit(1)
+        click.echo("OpenAPI spec is up to date.")
+        return
+
+    os.makedirs(os.path.dirname(SPEC_PATH), exist_ok=True)
+    with open(SPEC_PATH, "w") as f:
+        f.write(spec)
+    click.echo(f"Wrote {SPEC_PATH}")
@@ -0,0 +1,50 @@
+import base64
+import json
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+class InvalidPageParams(ValueError):
+    pass
+
+
+def encode_cursor(*values):
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise InvalidPageParams("Invalid cursor")
+    if not isinstance(values, list):
+        raise InvalidPageParams("Invalid cursor")
+    return values
+
+
+def parse_limit(value):
+    if value is None:
+        return DEFAULT_PAGE_LIMIT
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise InvalidPageParams("Limit must be an integer")
+    if limit < 1:
+        raise InvalidPageParams("Limit must be positive")
+    return min(limit, MAX_PAGE_LIMIT)
+
+
+def parse_fields(value, allowed):
+    """Requested fields from a comma-separated `fields=` value, in `allowed` order."""
+    if not value:
+        return list(allowed)
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise InvalidPageParams(f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}")
+    if not requested:
+        raise InvalidPageParams("fields must name at least one field")
+    return [field for field in allowed if field in requested]
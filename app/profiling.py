@@ -0,0 +1,75 @@
+import cProfile
+import functools
+import hmac
+import os
+import re
+import time
+import uuid
+from flask import after_this_request, request
+
+PROFILED_BLUEPRINTS = ("transactions", "user_name", "categories")
+PROFILE_HEADER = "X-Profile-Token"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+def _safe(value):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", value)[:64]
+
+
+def _rotate(directory, max_files):
+    profiles = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(".pstats")),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in profiles[:max(0, len(profiles) - max_files)]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def _profiled(app, endpoint, view):
+    token = app.config["PROFILING_TOKEN"].encode("utf-8")
+    directory = app.config["PROFILING_DIR"] or os.path.join(app.instance_path, "profiles")
+    max_files = app.config["PROFILING_MAX_FILES"]
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        supplied = request.headers.get(PROFILE_HEADER)
+        if not supplied or not hmac.compare_digest(supplied.encode("utf-8"), token):
+            return view(*args, **kwargs)
+
+        request_id = _safe(request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(view, *args, **kwargs)
+        finally:
+            os.makedirs(directory, exist_ok=True)
+            filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{_safe(endpoint)}-{request_id}.pstats"
+            profiler.dump_stats(os.path.join(directory, filename))
+            _rotate(directory, max_files)
+
+            @after_this_request
+            def add_profile_header(response):
+                response.headers["X-Profile"] = filename
+                return response
+
+    return wrapper
+
+
+def init_app(app):
+    """Wrap the API views in cProfile for requests that send PROFILE_HEADER.
+
+    Must run after the blueprints are registered. With PROFILING_ENABLED off
+    (the default) or no PROFILING_TOKEN the views are left untouched.
+    """
+    app.config.setdefault("PROFILING_ENABLED", False)
+    app.config.setdefault("PROFILING_TOKEN", None)
+    app.config.setdefault("PROFILING_DIR", None)
+    app.config.setdefault("PROFILING_MAX_FILES", 100)
+    if not app.config["PROFILING_ENABLED"] or not app.config["PROFILING_TOKEN"]:
+        return
+
+    for endpoint, view in list(app.view_functions.items()):
+        if endpoint.split(".", 1)[0] in PROFILED_BLUEPRINTS:
+            app.view_functions[endpoint] = _profiled(app, endpoint, view)
@@ -0,0 +1,200 @@
+import fcntl
+import functools
+import os
+import threading
+import time
+import click
+from flask import current_app, g, has_request_context, request
+from flask.cli import with_appcontext
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = "replica"
+STICKY_COOKIE = "read_primary_until"
+
+
+class RoutingSession(Session):
+    """Sends statements to the replica engine inside `reads_from_replica` views.
+
+    Flushes always go to the primary, so a view that unexpectedly writes still
+    writes to the right database.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() and g.get("use_replica"):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _note_write(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and (context.isinsert or context.isupdate or context.isdelete):
+        g.pending_write = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _note_committed_write(session):
+    if has_request_context() and g.pop("pending_write", False):
+        g.wrote_to_primary = True
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _drop_pending_write(session):
+    if has_request_context():
+        g.pop("pending_write", None)
+
+
+def _database_path(engine):
+    if engine.dialect.name != "sqlite" or engine.url.database in (None, "", ":memory:"):
+        return None
+    return engine.url.database
+
+
+def _snapshot_path(replica_path):
+    return replica_path + ".snapshot"
+
+
+def snapshot_time(engine):
+    """When the data in a SQLite replica was copied from the primary, or None."""
+    path = _database_path(engine)
+    try:
+        with open(_snapshot_path(path)) as f:
+            return float(f.read())
+    except (TypeError, OSError, ValueError):
+        return None
+
+
+def _last_write(path):
+    return max(
+        (os.stat(candidate).st_mtime for candidate in (path, path + "-wal") if os.path.exists(candidate)),
+        default=0.0
+    )
+
+
+def replica_is_current():
+    """True when the replica has every write the primary has.
+
+    Only known for the SQLite stand-in, by comparing the primary's file times
+    with the last snapshot; a server replica is assumed to lag.
+    """
+    engines = current_app.extensions["sqlalchemy"].engines
+    primary_path = _database_path(engines[None])
+    taken = snapshot_time(engines[REPLICA_BIND])
+    return primary_path is not None and taken is not None and _last_write(primary_path) < taken
+
+
+def refresh_replica():
+    """Copy the primary SQLite database into the replica with the backup API.
+
+    Returns False without copying when another process is already refreshing.
+    """
+    engines = current_app.extensions["sqlalchemy"].engines
+    primary, replica = engines[None], engines[REPLICA_BIND]
+    replica_path = _database_path(replica)
+    if _database_path(primary) is None or replica_path is None:
+        raise RuntimeError("The replica refresh only works between two SQLite database files")
+
+    with open(replica_path + ".lock", "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+
+        started = time.time()
+        source = primary.raw_connection()
+        target = replica.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+        finally:
+            target.close()
+            source.close()
+
+        snapshot = _snapshot_path(replica_path)
+        with open(snapshot + ".tmp", "w") as f:
+            f.write(repr(started))
+        os.replace(snapshot + ".tmp", snapshot)
+        return True
+
+
+def _refresh_forever(app, interval):
+    while True:
+        with app.app_context():
+            try:
+                refresh_replica()
+            except Exception:
+                app.logger.exception("Replica refresh failed")
+        time.sleep(interval)
+
+
+def reads_from_replica(view):
+    """Run a read-only view against the replica.
+
+    Falls back to the primary when no replica is configured, before its first
+    snapshot, and for clients that wrote within REPLICA_STICKY_SECONDS.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        engines = current_app.extensions["sqlalchemy"].engines
+        if REPLICA_BIND in engines and not _sticky() and (
+            snapshot_time(engines[REPLICA_BIND]) is not None or _database_path(engines[REPLICA_BIND]) is None
+        ):
+            g.use_replica = True
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def _sticky():
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _stick_to_primary(app, response):
+    """Keep a client on the primary after a request that committed a write.
+
+    Read-only POSTs such as the reports must not count, or a client polling
+    them would never reach the replica.
+    """
+    if g.get("wrote_to_primary") and response.status_code < 400:
+        window = app.config["REPLICA_STICKY_SECONDS"]
+        response.set_cookie(STICKY_COOKIE, repr(time.time() + window), max_age=window, httponly=True)
+    return response
+
+
+def can_cache_result():
+    return not g.get("use_replica") or replica_is_current()
+
+
+@click.group("replica")
+def replica_cli():
+    """Manage the local SQLite read replica."""
+
+
+@replica_cli.command("refresh")
+@with_appcontext
+def refresh_command():
+    """Copy the primary database into the replica now."""
+    if refresh_replica():
+        click.echo("Replica refreshed.")
+    else:
+        click.echo("Another process is refreshing the replica.")
+
+
+def init_app(app, report_cache):
+    app.config.setdefault("REPLICA_STICKY_SECONDS", 10)
+    app.config.setdefault("REPLICA_REFRESH_SECONDS", 5)
+    app.cli.add_command(replica_cli)
+    if REPLICA_BIND not in app.config.get("SQLALCHEMY_BINDS", {}):
+        return
+
+    if can_cache_result not in report_cache.store_checks:
+        report_cache.store_checks.append(can_cache_result)
+    app.after_request(lambda response: _stick_to_primary(app, response))
+
+    engines = app.extensions["sqlalchemy"].engines
+    if not event.contains(engines[None], "before_cursor_execute", _note_write):
+        event.listen(engines[None], "before_cursor_execute", _note_write)
+    interval = app.config["REPLICA_REFRESH_SECONDS"]
+    if interval and _database_path(engines[None]) and _database_path(engines[REPLICA_BIND]):
+        threading.Thread(target=_refresh_forever, args=(app, interval), daemon=True, name="replica-refresh").start()
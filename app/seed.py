@@ -0,0 +1,119 @@
+import random
+from datetime import datetime, timedelta
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, insert, text
+from app import db, bcrypt
+from app.users.models import User
+from app.categories.models import Category, transaction_categories
+from app.transactions.models import Transaction, user_transaction
+from app.transactions import rollups, search_index
+from app import versions
+from app.batching import batches
+
+SEED_BATCH_SIZE = 10000
+CATEGORY_NAMES = [
+    "groceries", "rent", "utilities", "transport", "restaurants", "health", "insurance", "salary",
+    "entertainment", "travel", "education", "clothing", "gifts", "subscriptions", "savings", "taxes"
+]
+DESCRIPTIONS = [
+    "uber ride", "rent march", "coffee", "supermarket", "electricity bill", "gym membership",
+    "monthly salary", "train ticket", "pharmacy", "cinema", "flight tickets", "book store"
+]
+
+
+def _zipf_weights(count, exponent=1.0):
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def _fan_out(rng, population, weights, maximum):
+    size = min(maximum, len(population), 1 + int(rng.expovariate(2.5)))
+    chosen = set()
+    while len(chosen) < size:
+        chosen.update(rng.choices(population, weights=weights, k=size - len(chosen)))
+    return chosen
+
+
+def seed_database(users, categories, transactions, months=24, max_users_per_transaction=3,
+                  max_categories_per_transaction=3, seed=None, batch_size=SEED_BATCH_SIZE):
+    rng = random.Random(seed)
+    password_hash = bcrypt.generate_password_hash("password").decode("utf-8")
+
+    first_user = (db.session.query(func.max(User.id)).scalar() or 0) + 1
+    user_rows = [
+        {
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "password_hash": password_hash,
+            "about_me": "Seeded user" if rng.random() < 0.3 else None
+        }
+        for i in range(first_user, first_user + users)
+    ]
+    for batch in batches(user_rows, batch_size):
+        db.session.execute(insert(User.__table__), batch)
+
+    first_category = (db.session.query(func.max(Category.id)).scalar() or 0) + 1
+    db.session.execute(insert(Category.__table__), [
+        {"name": CATEGORY_NAMES[i] if first_category == 1 and i < len(CATEGORY_NAMES) else f"category-{first_category + i}"}
+        for i in range(categories)
+    ])
+
+    user_ids = list(range(first_user, first_user + users))
+    category_ids = list(range(first_category, first_category + categories))
+    user_weights = _zipf_weights(len(user_ids), 0.8)
+    category_weights = _zipf_weights(len(category_ids), 1.1)
+    end = datetime.utcnow().replace(microsecond=0)
+    span = int(timedelta(days=30 * months).total_seconds())
+
+    first_transaction = (db.session.query(func.max(Transaction.id)).scalar() or 0) + 1
+    for ids in batches(range(first_transaction, first_transaction + transactions), batch_size):
+        transaction_rows = []
+        user_links = []
+        category_links = []
+        for transaction_id in ids:
+            is_expense = rng.random() < 0.8
+            transaction_rows.append({
+                "id": transaction_id,
+                "amount": round(rng.lognormvariate(3.5, 1.0) if is_expense else rng.lognormvariate(7, 0.5), 2),
+                "type": "expense" if is_expense else "revenue",
+                "description": f"{rng.choice(DESCRIPTIONS)} {rng.randint(1, 999)}",
+                "date": end - timedelta(seconds=rng.randrange(span))
+            })
+            for user_id in _fan_out(rng, user_ids, user_weights, max_users_per_transaction):
+                user_links.append({"user_id": user_id, "transaction_id": transaction_id})
+            for category_id in _fan_out(rng, category_ids, category_weights, max_categories_per_transaction):
+                category_links.append({"transaction_id": transaction_id, "category_id": category_id})
+
+        db.session.execute(insert(Transaction.__table__), transaction_rows)
+        db.session.execute(insert(user_transaction), user_links)
+        db.session.execute(insert(transaction_categories), category_links)
+        search_index.index_transactions(ids, new=True)
+
+    versions.bump(versions.USERS, versions.CATEGORIES, versions.TRANSACTIONS)
+    db.session.commit()
+    rollups.rebuild_rollups()
+    # Fresh planner statistics, so filtered transaction queries start from
+    # the most selective index instead of SQLite's defaults.
+    db.session.execute(text("ANALYZE"))
+    db.session.commit()
+
+
+@click.command("seed")
+@click.option("--users", default=1000, show_default=True, help="Number of users to create.")
+@click.option("--categories", default=30, show_default=True, help="Number of categories to create.")
+@click.option("--transactions", default=100000, show_default=True, help="Number of transactions to create.")
+@click.option("--months", default=24, show_default=True, help="Spread transaction dates over this many past months.")
+@click.option("--max-users-per-transaction", default=3, show_default=True)
+@click.option("--max-categories-per-transaction", default=3, show_default=True)
+@click.option("--seed", "random_seed", type=int, default=None, help="Random seed for reproducible data.")
+@with_appcontext
+def seed_command(users, categories, transactions, months, max_users_per_transaction,
+                 max_categories_per_transaction, random_seed):
+    """Fill the database with synthetic users, categories and transactions."""
+    seed_database(
+        users, categories, transactions, months=months,
+        max_users_per_transaction=max_users_per_transaction,
+        max_categories_per_transaction=max_categories_per_transaction,
+        seed=random_seed
+    )
+    click.echo(f"Seeded {users} users, {categories} categories and {transactions} transactions.")
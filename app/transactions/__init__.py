@@ -1,3 +1,3 @@
 from flask import Blueprint
 transactions_bp = Blueprint("transactions", __name__)
-from . import view
\ No newline at end of file
+from . import view, export, bulk, rollups, timeseries, batch_reports, jobs, search_index, search
\ No newline at end of file
@@ -0,0 +1,118 @@
+import json
+from datetime import datetime
+from flask import request, jsonify, Response, stream_with_context
+from app.openapi import swag_from
+from sqlalchemy import func, select
+from app import db
+from app.users.models import User
+from app.categories.models import Category
+from app.transactions.models import MonthlyCategoryTotal
+from app.transactions import transactions_bp, rollups
+
+BATCH_REPORT_YIELD_SIZE = 1000
+
+
+def _batch_monthly_query(user_ids, month, transaction_type, category_name):
+    totals = select(
+        MonthlyCategoryTotal.user_id,
+        Category.name.label("category"),
+        func.sum(MonthlyCategoryTotal.total_amount).label("total_amount")
+    ).join(
+        Category, Category.id == MonthlyCategoryTotal.category_id
+    ).where(
+        MonthlyCategoryTotal.month == month,
+        MonthlyCategoryTotal.transaction_count > 0
+    )
+    if transaction_type:
+        totals = totals.where(MonthlyCategoryTotal.type == transaction_type)
+    if category_name:
+        totals = totals.where(Category.name == category_name)
+    if user_ids is not None:
+        totals = totals.where(MonthlyCategoryTotal.user_id.in_(user_ids))
+    totals = totals.group_by(MonthlyCategoryTotal.user_id, Category.name).subquery()
+
+    query = select(User.id, totals.c.category, totals.c.total_amount).outerjoin(
+        totals, totals.c.user_id == User.id
+    )
+    if user_ids is not None:
+        query = query.where(User.id.in_(user_ids))
+    return query.order_by(User.id, totals.c.category).execution_options(yield_per=BATCH_REPORT_YIELD_SIZE)
+
+
+def _user_reports(rows, month):
+    current_user = None
+    totals = []
+    for user_id, category, total_amount in rows:
+        if user_id != current_user:
+            if current_user is not None:
+                yield {"user_id": current_user, "month": month, "totals": totals}
+            current_user = user_id
+            totals = []
+        if category is not None:
+            totals.append({"category": category, "total_amount": float(total_amount or 0)})
+    if current_user is not None:
+        yield {"user_id": current_user, "month": month, "totals": totals}
+
+
+@transactions_bp.route("/reports/monthly_expenses/batch", methods=["POST"])
+@swag_from({
+    "tags": ["Reports"],
+    "summary": "Get monthly per-category totals for many users",
+    "description": "Computes every requested user's per-category totals for one month in a single grouped query and streams one NDJSON line per user, ordered by user ID. Users without transactions get an empty totals list.",
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "user_ids": {
+                        "description": "List of user IDs, or \"all\"",
+                        "example": [1, 2, 3]
+                    },
+                    "month": {"type": "string", "description": "Format: YYYY-MM", "example": "2025-02"},
+                    "type": {"type": "string", "enum": ["expense", "revenue"], "example": "expense"},
+                    "category": {"type": "string", "example": "food"}
+                },
+                "required": ["user_ids", "month"]
+            }
+        }
+    ],
+    "produces": ["application/x-ndjson"],
+    "responses": {
+        "200": {"description": "One JSON object per line: {user_id, month, totals: [{category, total_amount}]}"},
+        "400": {"description": "Invalid input parameters"}
+    }
+})
+def batch_monthly_expenses():
+    data = request.get_json()
+    if not data:
+        return jsonify({"message": "Request body is required"}), 400
+
+    user_ids = data.get("user_ids")
+    if user_ids == "all":
+        user_ids = None
+    elif not isinstance(user_ids, list) or not user_ids or not all(
+        isinstance(u, int) and not isinstance(u, bool) for u in user_ids
+    ):
+        return jsonify({"message": "user_ids must be a non-empty list of integers or \"all\""}), 400
+
+    transaction_type = data.get("type")
+    category_name = data.get("category")
+    if transaction_type and transaction_type not in ['expense', 'revenue']:
+        return jsonify({"message": "Invalid transaction type. Must be 'expense' or 'revenue'"}), 400
+
+    try:
+        month = rollups.month_key(datetime.strptime(data.get("month") or "", "%Y-%m"))
+    except (TypeError, ValueError):
+        return jsonify({"message": "Invalid month format"}), 400
+
+    query = _batch_monthly_query(user_ids, month, transaction_type, category_name)
+
+    def generate():
+        rows = db.session.execute(query)
+        for report in _user_reports(rows, month):
+            yield json.dumps(report) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
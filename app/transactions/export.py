@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+from flask import request, jsonify, Response, stream_with_context
+from app.openapi import swag_from
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app import db
+from app.users.models import User
+from app.transactions.models import Transaction, user_transaction
+from app.transactions import transactions_bp
+
+EXPORT_BATCH_SIZE = 1000
+CSV_COLUMNS = ["id", "amount", "type", "categories", "description", "date", "users"]
+
+
+def _export_rows(user_id):
+    query = select(Transaction).options(
+        selectinload(Transaction.categories),
+        selectinload(Transaction.users)
+    )
+    if user_id is not None:
+        query = query.join(
+            user_transaction,
+            Transaction.id == user_transaction.c.transaction_id
+        ).where(user_transaction.c.user_id == user_id)
+    query = query.order_by(Transaction.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    for transaction in db.session.execute(query).scalars():
+        yield transaction.to_dict()
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        row["categories"] = ";".join(row["categories"])
+        row["users"] = ";".join(str(u) for u in row["users"])
+        writer.writerow([row[column] for column in CSV_COLUMNS])
+        yield buffer.getvalue()
+
+
+EXPORT_FORMATS = {
+    "ndjson": (_ndjson_lines, "application/x-ndjson"),
+    "csv": (_csv_lines, "text/csv"),
+}
+
+
+@transactions_bp.route("/transactions/export", methods=["GET"])
+@swag_from({
+    "tags": ["Transactions"],
+    "summary": "Export transactions",
+    "description": "Streams all transactions, or the transactions of one user, as NDJSON or CSV without buffering the whole result.",
+    "parameters": [
+        {"name": "format", "in": "query", "required": False, "type": "string", "enum": ["ndjson", "csv"], "default": "ndjson"},
+        {"name": "user_id", "in": "query", "required": False, "type": "integer", "description": "Only export this user's transactions"}
+    ],
+    "produces": ["application/x-ndjson", "text/csv"],
+    "responses": {
+        "200": {"description": "Streamed export"},
+        "400": {"description": "Unsupported export format or invalid user_id"},
+        "404": {"description": "User not found"}
+    }
+})
+def export_transactions():
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": "Unsupported format. Allowed: 'ndjson', 'csv'"}), 400
+
+    user_id = request.args.get("user_id")
+    if user_id is not None:
+        try:
+            user_id = int(user_id)
+        except ValueError:
+            return jsonify({"message": "user_id must be an integer"}), 400
+    if user_id is not None and not User.query.get(user_id):
+        return jsonify({"message": "User not found"}), 404
+
+    serializer, mimetype = EXPORT_FORMATS[export_format]
+    response = Response(
+        stream_with_context(serializer(_export_rows(user_id))),
+        mimetype=mimetype
+    )
+    response.headers["Content-Disposition"] = f"attachment; filename=transactions.{export_format}"
+    return response
@@ -0,0 +1,365 @@
+import contextvars
+import json
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app, request, jsonify, url_for
+from app.openapi import swag_from
+from sqlalchemy import event, func, insert, literal, select
+from werkzeug.exceptions import HTTPException
+from app import db
+from app.transactions.models import ReportJob
+from app.transactions import transactions_bp
+
+REPORT_ENDPOINTS = {
+    "monthly_expenses": "transactions.monthly_expenses",
+    "daily_expenses": "transactions.daily_expenses",
+    "range_total": "transactions.range_total",
+    "timeseries": "transactions.timeseries_report",
+    "monthly_expenses_batch": "transactions.batch_monthly_expenses"
+}
+ACTIVE_STATUSES = ("queued", "running")
+
+_executor = None
+_executor_lock = threading.Lock()
+_running = {}
+_current_job = contextvars.ContextVar("current_report_job", default=None)
+
+
+class _RunningJob:
+    def __init__(self):
+        self.future = None
+        self.connection = None
+        self.interrupted = False
+        # Held while the connection is set, cleared or interrupted, so a cancel
+        # can't reach a connection that went back to the pool.
+        self.lock = threading.Lock()
+
+
+def _get_executor(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get("REPORT_JOB_WORKERS", 2), thread_name_prefix="report-job"
+            )
+        return _executor
+
+
+def _track_statement_start(conn, cursor, statement, parameters, context, executemany):
+    handle = _current_job.get()
+    if handle is not None:
+        with handle.lock:
+            handle.connection = conn.connection.driver_connection
+
+
+def _track_statement_end(*args):
+    handle = _current_job.get()
+    if handle is not None:
+        with handle.lock:
+            handle.connection = None
+
+
+def _interrupt(handle):
+    handle.interrupted = True
+    with handle.lock:
+        connection = handle.connection
+        stop = getattr(connection, "interrupt", None) or getattr(connection, "cancel", None)
+        if stop is not None:
+            stop()
+
+
+@transactions_bp.record_once
+def _listen_for_job_statements(state):
+    with state.app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _track_statement_start)
+            event.listen(engine, "after_cursor_execute", _track_statement_end)
+            event.listen(engine, "handle_error", _track_statement_end)
+
+
+def _run_report(app, report, params):
+    endpoint = REPORT_ENDPOINTS[report]
+    path = next(app.url_map.iter_rules(endpoint)).rule
+    with app.test_request_context(path, method="POST", json=params):
+        try:
+            response = app.make_response(app.view_functions[endpoint]())
+        except HTTPException as e:
+            return e.code, None, e.description
+        body = response.get_data(as_text=True)
+        if response.mimetype == "application/x-ndjson":
+            result = [json.loads(line) for line in body.splitlines() if line]
+        else:
+            result = json.loads(body) if body else None
+        if response.status_code >= 400:
+            return response.status_code, None, (result or {}).get("message", "Report failed")
+        return response.status_code, result, None
+
+
+def _finish(job, status, status_code=None, result=None, error=None):
+    job.status = status
+    job.status_code = status_code
+    job.result = json.dumps(result) if result is not None else None
+    job.error = error
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+
+def _execute(app, job_id, handle):
+    try:
+        with app.app_context():
+            job = db.session.get(ReportJob, job_id)
+            if job is None:
+                return
+            if job.cancel_requested:
+                _finish(job, "cancelled")
+                return
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.session.commit()
+            report, params = job.report, json.loads(job.params)
+
+        token = _current_job.set(handle)
+        try:
+            status_code, result, error = _run_report(app, report, params)
+        except Exception:
+            if not handle.interrupted:
+                app.logger.exception("Report job %s failed", job_id)
+            status_code, result, error = 500, None, "Report failed"
+        finally:
+            _current_job.reset(token)
+
+        with app.app_context():
+            job = db.session.get(ReportJob, job_id)
+            if job is None:
+                return
+            if job.cancel_requested:
+                _finish(job, "cancelled")
+            elif error is not None:
+                _finish(job, "failed", status_code, error=error)
+            else:
+                _finish(job, "succeeded", status_code, result=result)
+    finally:
+        _running.pop(job_id, None)
+
+
+def _purge_expired():
+    ReportJob.query.filter(ReportJob.expires_at < datetime.utcnow()).delete(synchronize_session=False)
+
+
+def _worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _fail_orphaned():
+    """Fail the active jobs of worker processes on this host that have exited.
+
+    A restarted worker loses its queue, and those jobs would otherwise count
+    against the limits until they expire.
+    """
+    host, _, _ = _worker_id().rpartition(":")
+    orphaned = []
+    for job in ReportJob.query.filter(ReportJob.status.in_(ACTIVE_STATUSES)):
+        job_host, _, pid = job.worker.rpartition(":")
+        if job_host != host:
+            continue
+        if int(pid) == os.getpid():
+            if job.id not in _running:
+                orphaned.append(job)
+        elif not _is_alive(int(pid)):
+            orphaned.append(job)
+    for job in orphaned:
+        job.status = "failed"
+        job.status_code = 500
+        job.error = "The worker running the report exited"
+        job.finished_at = datetime.utcnow()
+
+
+def _tenant(params):
+    user_id = params.get("user_id")
+    return f"user:{user_id}" if user_id is not None else "all-users"
+
+
+def _active_jobs(*criteria):
+    return select(func.count()).where(
+        ReportJob.status.in_(ACTIVE_STATUSES),
+        ReportJob.expires_at >= datetime.utcnow(),
+        *criteria
+    ).scalar_subquery()
+
+
+def _queue_job(values, queue_limit, tenant_limit):
+    """Insert the job only if both limits still allow it, as one statement.
+
+    Counting first and inserting after lets concurrent workers both pass the
+    check; a single INSERT ... SELECT runs under the database write lock.
+    """
+    columns = ReportJob.__table__.c
+    row = select(*(literal(value, columns[name].type) for name, value in values.items())).where(
+        _active_jobs() < queue_limit,
+        _active_jobs(ReportJob.tenant == values["tenant"]) < tenant_limit
+    )
+    return db.session.execute(insert(ReportJob).from_select(list(values), row)).rowcount == 1
+
+
+@transactions_bp.route("/reports/jobs", methods=["POST"])
+@swag_from({
+    "tags": ["Reports"],
+    "summary": "Run a report in the background",
+    "description": "Queues a report on the background worker pool and returns a job ID immediately. Poll the job's status URL for the result. At most REPORT_JOBS_PER_TENANT jobs per user (or per all-users batch) and REPORT_JOB_QUEUE_LIMIT jobs in total can be queued or running at once.",
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "report": {"type": "string", "enum": list(REPORT_ENDPOINTS), "example": "daily_expenses"},
+                    "params": {
+                        "type": "object",
+                        "description": "The request body the synchronous report endpoint takes",
+                        "example": {"user_id": 1, "type": "expense", "start_date": "2020-01-01", "end_date": "2025-12-31"}
+                    }
+                },
+                "required": ["report", "params"]
+            }
+        }
+    ],
+    "responses": {
+        "202": {"description": "Job queued"},
+        "400": {"description": "Unknown report or missing params"},
+        "429": {"description": "Too many active jobs for this user"},
+        "503": {"description": "The job queue is full"}
+    }
+})
+def submit_report_job():
+    data = request.get_json()
+    if not data:
+        return jsonify({"message": "Request body is required"}), 400
+
+    report = data.get("report")
+    params = data.get("params")
+    if report not in REPORT_ENDPOINTS:
+        return jsonify({"message": f"report must be one of: {', '.join(REPORT_ENDPOINTS)}"}), 400
+    if not isinstance(params, dict):
+        return jsonify({"message": "params must be an object"}), 400
+
+    app = current_app._get_current_object()
+    queue_limit = app.config.get("REPORT_JOB_QUEUE_LIMIT", 20)
+    tenant_limit = app.config.get("REPORT_JOBS_PER_TENANT", 2)
+    tenant = _tenant(params)
+    _purge_expired()
+    _fail_orphaned()
+
+    now = datetime.utcnow()
+    job_id = uuid.uuid4().hex
+    # Registered before the insert commits, so _fail_orphaned in another
+    # request thread never sees this worker's job without its handle.
+    handle = _RunningJob()
+    _running[job_id] = handle
+    queued = _queue_job({
+        "id": job_id,
+        "report": report,
+        "params": json.dumps(params),
+        "tenant": tenant,
+        "status": "queued",
+        "worker": _worker_id(),
+        "cancel_requested": False,
+        "created_at": now,
+        "expires_at": now + timedelta(seconds=app.config.get("REPORT_JOB_TTL_SECONDS", 3600))
+    }, queue_limit, tenant_limit)
+    db.session.commit()
+    if not queued:
+        _running.pop(job_id, None)
+        if db.session.execute(select(_active_jobs())).scalar() >= queue_limit:
+            return jsonify({"message": "Report job queue is full, try again later"}), 503
+        return jsonify({"message": "Too many report jobs running for this user"}), 429
+
+    job = db.session.get(ReportJob, job_id)
+    handle.future = _get_executor(app).submit(_execute, app, job.id, handle)
+
+    response = job.to_dict()
+    response["status_url"] = url_for("transactions.get_report_job", job_id=job.id)
+    return jsonify(response), 202
+
+
+@transactions_bp.route("/reports/jobs/<job_id>", methods=["GET"])
+@swag_from({
+    "tags": ["Reports"],
+    "summary": "Get a background report job",
+    "description": "Returns the job status (queued, running, succeeded, failed or cancelled). Finished jobs include the report result or the error. Jobs whose worker process exited are reported as failed. Jobs are deleted once they expire.",
+    "parameters": [
+        {"name": "job_id", "in": "path", "type": "string", "required": True}
+    ],
+    "responses": {
+        "200": {"description": "Job status"},
+        "404": {"description": "Job not found or expired"}
+    }
+})
+def get_report_job(job_id):
+    job = db.session.get(ReportJob, job_id)
+    if not job or job.expires_at < datetime.utcnow():
+        return jsonify({"message": "Report job not found"}), 404
+    if job.status in ACTIVE_STATUSES:
+        _fail_orphaned()
+        db.session.commit()
+
+    response = job.to_dict()
+    if job.status == "succeeded":
+        response["result"] = json.loads(job.result) if job.result is not None else None
+    elif job.status == "failed":
+        response["error"] = job.error
+        response["status_code"] = job.status_code
+    return jsonify(response)
+
+
+@transactions_bp.route("/reports/jobs/<job_id>", methods=["DELETE"])
+@swag_from({
+    "tags": ["Reports"],
+    "summary": "Cancel a background report job",
+    "description": "Cancels a queued job, or interrupts the running query of a job running in this worker process. Jobs running in another worker are marked and their result is discarded when they finish.",
+    "parameters": [
+        {"name": "job_id", "in": "path", "type": "string", "required": True}
+    ],
+    "responses": {
+        "200": {"description": "Cancellation requested"},
+        "404": {"description": "Job not found or expired"},
+        "409": {"description": "Job already finished"}
+    }
+})
+def cancel_report_job(job_id):
+    job = db.session.get(ReportJob, job_id)
+    if not job or job.expires_at < datetime.utcnow():
+        return jsonify({"message": "Report job not found"}), 404
+    if job.status not in ACTIVE_STATUSES:
+        return jsonify({"message": f"Report job already {job.status}"}), 409
+
+    job.cancel_requested = True
+    db.session.commit()
+
+    # A handle without a future is still being submitted; _execute sees the flag.
+    handle = _running.get(job_id)
+    future = handle.future if handle is not None else None
+    if future is not None and not future.cancel():
+        _interrupt(handle)
+    elif future is not None:
+        _running.pop(job_id, None)
+        job.status = "cancelled"
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+    return jsonify(job.to_dict())
@@ -5,11 +5,17 @@ from app.categories.models import transaction_categories
 user_transaction = db.Table(
     "user_transaction",
     db.Column("user_id", db.Integer, db.ForeignKey("users.id"), primary_key=True),
-    db.Column("transaction_id", db.Integer, db.ForeignKey("transactions.id"), primary_key=True)
+    db.Column("transaction_id", db.Integer, db.ForeignKey("transactions.id"), primary_key=True),
+    db.Index("ix_user_transaction_transaction_id", "transaction_id", "user_id")
 )
 
 class Transaction(db.Model):
     __tablename__ = "transactions"
+    __table_args__ = (
+        db.Index("ix_transactions_date", "date"),
+        db.Index("ix_transactions_type_date_amount", "type", "date", "amount"),
+        db.Index("ix_transactions_amount", "amount"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(db.Float, nullable=False)
     type = db.Column(db.Enum("expense", "revenue", name="transaction_type"), nullable=False)
@@ -25,4 +31,69 @@ class Transaction(db.Model):
         self.description = description
         self.date = date if date else datetime.utcnow() 
         if categories:
-            self.categories = categories
\ No newline at end of file
+            self.categories = categories
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "amount": self.amount,
+            "type": self.type,
+            "categories": [category.name for category in self.categories],
+            "description": self.description,
+            "date": self.date.isoformat(),
+            "users": [user.id for user in self.users]
+        }
+
+
+class MonthlyCategoryTotal(db.Model):
+    __tablename__ = "monthly_category_totals"
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    month = db.Column(db.String(7), primary_key=True)
+    type = db.Column(db.Enum("expense", "revenue", name="transaction_type"), primary_key=True)
+    category_id = db.Column(db.Integer, db.ForeignKey("categories.id"), primary_key=True)
+    total_amount = db.Column(db.Float, nullable=False, default=0)
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailyTotal(db.Model):
+    __tablename__ = "daily_totals"
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    type = db.Column(db.Enum("expense", "revenue", name="transaction_type"), primary_key=True)
+    day = db.Column(db.String(10), primary_key=True)
+    total_amount = db.Column(db.Float, nullable=False, default=0)
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+    cumulative_amount = db.Column(db.Float, nullable=False, default=0)
+    cumulative_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ReportJob(db.Model):
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        db.Index("ix_report_jobs_tenant_status", "tenant", "status"),
+        db.Index("ix_report_jobs_expires_at", "expires_at"),
+    )
+    id = db.Column(db.String(32), primary_key=True)
+    report = db.Column(db.String(40), nullable=False)
+    params = db.Column(db.Text, nullable=False)
+    tenant = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default="queued")
+    worker = db.Column(db.String(128), nullable=False)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.String(255), nullable=True)
+    status_code = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "report": self.report,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "expires_at": self.expires_at.isoformat()
+        }
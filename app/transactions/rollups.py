@@ -0,0 +1,359 @@
+from collections import defaultdict
+import click
+from datetime import date
+from sqlalchemy import bindparam, delete, event, func, insert, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as upsert
+from app import db, report_cache
+from app.cache import ALL_USERS, ALL_MONTHS
+from app.categories.models import transaction_categories
+from app.transactions.models import Transaction, MonthlyCategoryTotal, DailyTotal, user_transaction
+from app.transactions import transactions_bp
+
+rollup_table = MonthlyCategoryTotal.__table__
+daily_table = DailyTotal.__table__
+
+DRIFT_TOLERANCE = 1e-6
+PENDING_INVALIDATIONS = "report_cache_invalidations"
+
+
+def month_key(date):
+    return date.strftime("%Y-%m")
+
+
+def day_key(date):
+    return date.strftime("%Y-%m-%d")
+
+
+def months_between(start, end):
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(month_key(date(year, month, 1)))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def invalidate_reports(user_id=ALL_USERS, month=ALL_MONTHS):
+    db.session.info.setdefault(PENDING_INVALIDATIONS, set()).add((user_id, month))
+
+
+@event.listens_for(db.session, "after_commit")
+def _flush_report_invalidations(session):
+    for user_id, month in session.info.pop(PENDING_INVALIDATIONS, ()):
+        report_cache.invalidate(user_id, month)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _drop_report_invalidations(session):
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+class Deltas:
+    def __init__(self):
+        self.monthly = defaultdict(lambda: [0.0, 0])
+        self.daily = defaultdict(lambda: [0.0, 0])
+
+
+def new_deltas():
+    return Deltas()
+
+
+def collect_deltas(deltas, user_ids, category_ids, date, transaction_type, amount, sign=1):
+    month = month_key(date)
+    day = day_key(date)
+    for user_id in user_ids:
+        daily = deltas.daily[(user_id, transaction_type, day)]
+        daily[0] += sign * amount
+        daily[1] += sign
+        for category_id in category_ids:
+            monthly = deltas.monthly[(user_id, month, transaction_type, category_id)]
+            monthly[0] += sign * amount
+            monthly[1] += sign
+
+
+def collect_transaction(deltas, transaction, sign=1):
+    collect_deltas(
+        deltas,
+        [user.id for user in transaction.users],
+        [category.id for category in transaction.categories],
+        transaction.date,
+        transaction.type,
+        transaction.amount,
+        sign
+    )
+
+
+def _upsert_statement(table, sums):
+    statement = upsert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[c.name for c in table.primary_key.columns],
+        set_={name: table.c[name] + statement.excluded[name] for name in sums}
+    )
+
+
+def _prune_empty(table, rows):
+    """Delete the rows of these keys whose count dropped to zero, by primary key."""
+    keys = [column.name for column in table.primary_key.columns]
+    emptied = [{f"key_{key}": row[key] for key in keys} for row in rows if row["transaction_count"] < 0]
+    if emptied:
+        db.session.execute(
+            delete(table).where(
+                *(table.c[key] == bindparam(f"key_{key}") for key in keys),
+                table.c.transaction_count <= 0
+            ),
+            emptied
+        )
+
+
+def _apply_monthly(deltas):
+    rows = [
+        {
+            "user_id": user_id,
+            "month": month,
+            "type": transaction_type,
+            "category_id": category_id,
+            "total_amount": amount,
+            "transaction_count": count
+        }
+        for (user_id, month, transaction_type, category_id), (amount, count) in deltas.items()
+        if count or amount
+    ]
+    for row in rows:
+        invalidate_reports(row["user_id"], row["month"])
+    if rows:
+        db.session.execute(_upsert_statement(rollup_table, ["total_amount", "transaction_count"]), rows)
+        _prune_empty(rollup_table, rows)
+
+
+def _recompute_daily_running_totals(first_days):
+    """Rewrite the running totals of each series from its earliest changed day on.
+
+    One UPDATE ... FROM, executed once per series: a windowed sum over the
+    series' days from first_day, seeded with the running total of the last
+    earlier day, so the cost is the changed suffix rather than the history.
+    """
+    user_id, transaction_type, first_day = bindparam("series_user_id"), bindparam("series_type"), bindparam("first_day")
+    previous = daily_table.alias("previous")
+    suffix = daily_table.alias("suffix")
+
+    def seed(column):
+        return func.coalesce(
+            select(column)
+            .where(previous.c.user_id == user_id, previous.c.type == transaction_type, previous.c.day < first_day)
+            .order_by(previous.c.day.desc())
+            .limit(1)
+            .scalar_subquery(),
+            0
+        )
+
+    running = select(
+        suffix.c.day,
+        (seed(previous.c.cumulative_amount) + func.sum(suffix.c.total_amount).over(order_by=suffix.c.day)).label("cumulative_amount"),
+        (seed(previous.c.cumulative_count) + func.sum(suffix.c.transaction_count).over(order_by=suffix.c.day)).label("cumulative_count")
+    ).where(suffix.c.user_id == user_id, suffix.c.type == transaction_type, suffix.c.day >= first_day).subquery("running")
+
+    db.session.execute(
+        update(daily_table)
+        .where(
+            daily_table.c.user_id == user_id,
+            daily_table.c.type == transaction_type,
+            daily_table.c.day == running.c.day,
+            or_(
+                daily_table.c.cumulative_amount != running.c.cumulative_amount,
+                daily_table.c.cumulative_count != running.c.cumulative_count
+            )
+        )
+        .values(cumulative_amount=running.c.cumulative_amount, cumulative_count=running.c.cumulative_count),
+        [
+            {"series_user_id": series_user_id, "series_type": series_type, "first_day": day}
+            for (series_user_id, series_type), day in sorted(first_days.items())
+        ]
+    )
+
+
+def _apply_daily(deltas):
+    rows = [
+        {
+            "user_id": user_id,
+            "type": transaction_type,
+            "day": day,
+            "total_amount": amount,
+            "transaction_count": count,
+            "cumulative_amount": 0.0,
+            "cumulative_count": 0
+        }
+        for (user_id, transaction_type, day), (amount, count) in deltas.items()
+        if count or amount
+    ]
+    if not rows:
+        return
+    for row in rows:
+        invalidate_reports(row["user_id"], row["day"][:7])
+    db.session.execute(_upsert_statement(daily_table, ["total_amount", "transaction_count"]), rows)
+    _prune_empty(daily_table, rows)
+
+    first_days = {}
+    for row in rows:
+        series = (row["user_id"], row["type"])
+        first_days[series] = min(first_days.get(series, row["day"]), row["day"])
+    _recompute_daily_running_totals(first_days)
+
+
+def apply_deltas(deltas):
+    _apply_monthly(deltas.monthly)
+    _apply_daily(deltas.daily)
+
+
+def add_transaction(transaction):
+    deltas = new_deltas()
+    collect_transaction(deltas, transaction)
+    apply_deltas(deltas)
+
+
+def remove_transaction(transaction):
+    deltas = new_deltas()
+    collect_transaction(deltas, transaction, sign=-1)
+    apply_deltas(deltas)
+
+
+def forget_user(user_id):
+    invalidate_reports(user_id)
+    db.session.execute(delete(rollup_table).where(rollup_table.c.user_id == user_id))
+    db.session.execute(delete(daily_table).where(daily_table.c.user_id == user_id))
+
+
+def forget_category(category_id):
+    invalidate_reports()
+    db.session.execute(delete(rollup_table).where(rollup_table.c.category_id == category_id))
+
+
+def _monthly_source():
+    month = func.strftime("%Y-%m", Transaction.date)
+    return select(
+        user_transaction.c.user_id,
+        month,
+        Transaction.type,
+        transaction_categories.c.category_id,
+        func.sum(Transaction.amount),
+        func.count()
+    ).join(
+        user_transaction, Transaction.id == user_transaction.c.transaction_id
+    ).join(
+        transaction_categories, Transaction.id == transaction_categories.c.transaction_id
+    ).where(
+        Transaction.date.is_not(None)
+    ).group_by(
+        user_transaction.c.user_id, month, Transaction.type, transaction_categories.c.category_id
+    )
+
+
+def _daily_source():
+    day = func.date(Transaction.date)
+    series = [user_transaction.c.user_id, Transaction.type]
+    return select(
+        user_transaction.c.user_id,
+        Transaction.type,
+        day,
+        func.sum(Transaction.amount),
+        func.count(),
+        func.sum(func.sum(Transaction.amount)).over(partition_by=series, order_by=day),
+        func.sum(func.count()).over(partition_by=series, order_by=day)
+    ).join(
+        user_transaction, Transaction.id == user_transaction.c.transaction_id
+    ).where(
+        Transaction.date.is_not(None)
+    ).group_by(
+        user_transaction.c.user_id, Transaction.type, day
+    )
+
+
+def rebuild_rollups():
+    invalidate_reports()
+    db.session.execute(delete(rollup_table))
+    db.session.execute(insert(rollup_table).from_select(
+        ["user_id", "month", "type", "category_id", "total_amount", "transaction_count"],
+        _monthly_source()
+    ))
+    db.session.execute(delete(daily_table))
+    db.session.execute(insert(daily_table).from_select(
+        ["user_id", "type", "day", "total_amount", "transaction_count", "cumulative_amount", "cumulative_count"],
+        _daily_source()
+    ))
+    db.session.commit()
+    return (
+        db.session.query(func.count()).select_from(rollup_table).scalar(),
+        db.session.query(func.count()).select_from(daily_table).scalar()
+    )
+
+
+def _drift(table_name, expected, actual):
+    drift = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        want = expected.get(key)
+        have = actual.get(key)
+        if want is None or have is None or any(abs(w - h) > DRIFT_TOLERANCE for w, h in zip(want, have)):
+            drift.append({"table": table_name, "key": list(key), "expected": want, "actual": have})
+    return drift
+
+
+def check_rollups():
+    expected = {tuple(row[:4]): tuple(row[4:]) for row in db.session.execute(_monthly_source())}
+    actual = {tuple(row[:4]): tuple(row[4:]) for row in db.session.execute(select(rollup_table))}
+    drift = _drift(rollup_table.name, expected, actual)
+
+    expected = {tuple(row[:3]): tuple(row[3:]) for row in db.session.execute(_daily_source())}
+    actual = {tuple(row[:3]): tuple(row[3:]) for row in db.session.execute(select(daily_table))}
+    return drift + _drift(daily_table.name, expected, actual)
+
+
+def daily_range_total(user_id, transaction_type, start_day, end_day):
+    series = (daily_table.c.user_id == user_id) & (daily_table.c.type == transaction_type)
+
+    def cumulative_through(day, inclusive):
+        bound = daily_table.c.day <= day if inclusive else daily_table.c.day < day
+        row = db.session.execute(
+            select(daily_table.c.cumulative_amount, daily_table.c.cumulative_count)
+            .where(series, bound)
+            .order_by(daily_table.c.day.desc())
+            .limit(1)
+        ).first()
+        return row if row else (0.0, 0)
+
+    end_amount, end_count = cumulative_through(end_day, inclusive=True)
+    start_amount, start_count = cumulative_through(start_day, inclusive=False)
+    return end_amount - start_amount, end_count - start_count
+
+
+def balance_through(user_id, day=None):
+    """Cumulative (amount, count, last day) per type up to and including `day`, or all time.
+
+    One primary key seek per type, however long the user's history is.
+    """
+    totals = {}
+    for transaction_type in ("revenue", "expense"):
+        query = select(
+            daily_table.c.cumulative_amount, daily_table.c.cumulative_count, daily_table.c.day
+        ).where(daily_table.c.user_id == user_id, daily_table.c.type == transaction_type)
+        if day is not None:
+            query = query.where(daily_table.c.day <= day)
+        row = db.session.execute(query.order_by(daily_table.c.day.desc()).limit(1)).first()
+        totals[transaction_type] = tuple(row) if row else (0.0, 0, None)
+    return totals
+
+
+@transactions_bp.cli.command("rebuild-rollups")
+def rebuild_rollups_command():
+    """Recompute the monthly and daily aggregates from the transactions table."""
+    monthly_rows, daily_rows = rebuild_rollups()
+    click.echo(f"Rebuilt {monthly_rows} monthly category totals and {daily_rows} daily totals.")
+
+
+@transactions_bp.cli.command("check-rollups")
+def check_rollups_command():
+    """Compare the monthly and daily aggregates against the transactions table."""
+    drift = check_rollups()
+    for entry in drift:
+        click.echo(f"{entry['table']} {entry['key']}: expected {entry['expected']}, found {entry['actual']}")
+    if drift:
+        raise click.ClickException(f"{len(drift)} aggregate rows drifted. Run 'flask transactions rebuild-rollups'.")
+    click.echo("Aggregates are consistent.")
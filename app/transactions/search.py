@@ -0,0 +1,111 @@
+import click
+from flask import request, jsonify
+from sqlalchemy import select, text
+from app.openapi import swag_from
+from app import db, versions
+from app.replica import reads_from_replica
+from app.users.models import User
+from app.transactions.models import Transaction
+from app.transactions import transactions_bp
+from app.transactions.search_index import rebuild_search_index
+from app.transactions.view import TRANSACTION_FIELDS, transaction_columns, transaction_dicts
+from app.pagination import InvalidPageParams, decode_cursor, encode_cursor, parse_fields, parse_limit
+
+MAX_QUERY_LENGTH = 200
+
+
+def match_expression(query, user_id):
+    """FTS5 query for the whitespace-separated terms, all required; a trailing * matches a prefix.
+
+    Every term is quoted, so FTS5 operators typed by the user are searched
+    for literally rather than parsed.
+    """
+    phrases = []
+    for term in query.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if any(character.isalnum() for character in term):
+            phrases.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not phrases:
+        return None
+    return f"user_ids:u{user_id} AND description:({' '.join(phrases)})"
+
+
+@transactions_bp.route("/users/<int:user_id>/transactions/search", methods=["GET"])
+@swag_from({
+    "tags": ["Transactions"],
+    "summary": "Search a user's transactions by description",
+    "description": "Full-text search over the descriptions of the user's transactions, best match first (BM25). Every term must match; end a term with * to match it as a prefix. Pass the returned next_cursor to fetch the following page.",
+    "parameters": [
+        {"name": "user_id", "in": "path", "required": True, "type": "integer"},
+        {"name": "q", "in": "query", "required": True, "type": "string", "description": "Search terms", "example": "rent march"},
+        {"name": "limit", "in": "query", "required": False, "type": "integer", "description": "Page size (default 100, max 1000)"},
+        {"name": "cursor", "in": "query", "required": False, "type": "string", "description": "Opaque cursor from a previous page"},
+        {"name": "fields", "in": "query", "required": False, "type": "string", "description": "Comma-separated subset of id, amount, type, categories, description, date, users (default: all)"}
+    ],
+    "responses": {
+        "200": {"description": "Page of matching transactions with next_cursor"},
+        "400": {"description": "Missing query, or invalid limit, cursor or fields"},
+        "404": {"description": "User not found"}
+    }
+})
+@reads_from_replica
+@versions.conditional(versions.user_scope, versions.CATEGORIES)
+def search_transactions(user_id):
+    query = request.args.get("q", "")
+    if len(query) > MAX_QUERY_LENGTH:
+        return jsonify({"message": f"Query must be at most {MAX_QUERY_LENGTH} characters"}), 400
+    match = match_expression(query, user_id)
+    if not match:
+        return jsonify({"message": "Query must contain at least one word"}), 400
+    try:
+        fields = parse_fields(request.args.get("fields"), TRANSACTION_FIELDS)
+    except InvalidPageParams as e:
+        return jsonify({"message": str(e)}), 400
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        cursor = request.args.get("cursor")
+        if cursor:
+            cursor_score, cursor_id = decode_cursor(cursor)
+            cursor_score = float(cursor_score)
+            cursor_id = int(cursor_id)
+    except (InvalidPageParams, TypeError, ValueError):
+        return jsonify({"message": "Invalid limit or cursor"}), 400
+
+    if not User.query.get(user_id):
+        return jsonify({"message": "User not found"}), 404
+
+    # bm25() is lower for better matches; user_ids gets no weight.
+    ranked = """
+        SELECT rowid AS id, bm25(transaction_search, 1.0, 0.0) AS score
+        FROM transaction_search WHERE transaction_search MATCH :match
+    """
+    params = {"match": match, "limit": limit + 1}
+    if cursor:
+        ranked = f"SELECT id, score FROM ({ranked}) WHERE score > :score OR (score = :score AND id > :id)"
+        params.update(score=cursor_score, id=cursor_id)
+    hits = db.session.execute(text(f"{ranked} ORDER BY score, id LIMIT :limit"), params).all()
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = encode_cursor(hits[-1].score, hits[-1].id)
+
+    rows = []
+    if hits:
+        rows_by_id = {row.id: row for row in db.session.execute(
+            select(*transaction_columns(fields)).where(Transaction.__table__.c.id.in_([hit.id for hit in hits]))
+        )}
+        rows = [rows_by_id[hit.id] for hit in hits if hit.id in rows_by_id]
+
+    return jsonify({
+        "transactions": transaction_dicts(rows, fields),
+        "next_cursor": next_cursor
+    })
+
+
+@transactions_bp.cli.command("rebuild-search")
+def rebuild_search_command():
+    """Rebuild the full-text search table over transaction descriptions."""
+    count = rebuild_search_index()
+    click.echo(f"Indexed {count} transactions.")
@@ -0,0 +1,78 @@
+from sqlalchemy import bindparam, event, text
+from app import db
+from app.batching import batches
+
+PENDING_REINDEX = "search_reindex"
+
+# An FTS5 table keyed by transaction id. user_ids holds a "u<id>" token per
+# linked user, so the user filter is answered by the index instead of a join.
+# Like the rollups it is maintained by the write paths rather than triggers:
+# FTS5 writes made from a trigger flush the index on every statement, which
+# made bulk inserts several times slower than set-based updates.
+SEARCH_DDL = "CREATE VIRTUAL TABLE IF NOT EXISTS transaction_search USING fts5(description, user_ids)"
+
+_delete_rows = text("DELETE FROM transaction_search WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True))
+_insert_rows = text("""
+    INSERT INTO transaction_search(rowid, description, user_ids)
+    SELECT t.id, coalesce(t.description, ''), group_concat('u' || ut.user_id, ' ')
+    FROM transactions t JOIN user_transaction ut ON ut.transaction_id = t.id
+    WHERE t.id IN :ids
+    GROUP BY t.id
+""").bindparams(bindparam("ids", expanding=True))
+
+
+@event.listens_for(db.metadata, "after_create")
+def _create_search_table(target, connection, **kw):
+    connection.exec_driver_sql(SEARCH_DDL)
+
+
+@event.listens_for(db.metadata, "before_drop")
+def _drop_search_table(target, connection, **kw):
+    connection.exec_driver_sql("DROP TABLE IF EXISTS transaction_search")
+
+
+def index_transactions(ids, new=False):
+    """Rewrite the search rows of these transactions from the current tables.
+
+    `new` skips the delete for ids that cannot be indexed yet, as in bulk inserts.
+    """
+    for batch in batches(sorted(set(ids))):
+        if not new:
+            db.session.execute(_delete_rows, {"ids": batch})
+        db.session.execute(_insert_rows, {"ids": batch})
+
+
+def reindex_on_commit(*transactions):
+    """Queue transactions, or their ids, to be reindexed when the session commits."""
+    db.session.info.setdefault(PENDING_REINDEX, []).extend(transactions)
+
+
+@event.listens_for(db.session, "before_commit")
+def _reindex_pending(session):
+    pending = session.info.get(PENDING_REINDEX)
+    if not pending:
+        return
+    session.flush()
+    session.info.pop(PENDING_REINDEX)
+    index_transactions([item if isinstance(item, int) else item.id for item in pending])
+
+
+@event.listens_for(db.session, "after_rollback")
+def _drop_pending(session):
+    session.info.pop(PENDING_REINDEX, None)
+
+
+def rebuild_search_index():
+    """Recreate the search table from the transactions and their users."""
+    db.session.execute(text("DROP TABLE IF EXISTS transaction_search"))
+    db.session.execute(text(SEARCH_DDL))
+    db.session.execute(text("""
+        INSERT INTO transaction_search(rowid, description, user_ids)
+        SELECT t.id, coalesce(t.description, ''), group_concat('u' || ut.user_id, ' ')
+        FROM transactions t JOIN user_transaction ut ON ut.transaction_id = t.id
+        GROUP BY t.id
+    """))
+    db.session.execute(text("INSERT INTO transaction_search(transaction_search) VALUES ('optimize')"))
+    count = db.session.execute(text("SELECT count(*) FROM transaction_search")).scalar()
+    db.session.commit()
+    return count
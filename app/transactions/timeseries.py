@@ -0,0 +1,176 @@
+from flask import request, jsonify
+from app.openapi import swag_from
+from datetime import timedelta
+from sqlalchemy import func
+from app import db, report_cache
+from app.replica import reads_from_replica
+from app.categories.models import Category, transaction_categories
+from app.transactions.models import Transaction, MonthlyCategoryTotal, user_transaction
+from app.transactions import transactions_bp, rollups
+from app.transactions.view import month_range, report_filters
+
+MAX_TIMESERIES_MONTHS = 60
+GRANULARITIES = ("day", "week", "month")
+
+
+def _next_month(date):
+    return date.replace(year=date.year + 1, month=1) if date.month == 12 else date.replace(month=date.month + 1)
+
+
+def bucket_keys(start, end, granularity):
+    keys = []
+    if granularity == "month":
+        current = start
+        while current < end:
+            keys.append(rollups.month_key(current))
+            current = _next_month(current)
+    else:
+        step = timedelta(days=7 if granularity == "week" else 1)
+        current = start - timedelta(days=start.weekday()) if granularity == "week" else start
+        while current < end:
+            keys.append(rollups.day_key(current))
+            current += step
+    return keys
+
+
+def _grouped_totals(user_id, start, end, granularity, transaction_type, category_name):
+    if granularity == "month":
+        bucket = MonthlyCategoryTotal.month
+        query = db.session.query(
+            bucket, Category.name, func.sum(MonthlyCategoryTotal.total_amount)
+        ).join(
+            Category, Category.id == MonthlyCategoryTotal.category_id
+        ).filter(
+            MonthlyCategoryTotal.user_id == user_id,
+            MonthlyCategoryTotal.month >= rollups.month_key(start),
+            MonthlyCategoryTotal.month < rollups.month_key(end),
+            MonthlyCategoryTotal.transaction_count > 0
+        )
+        type_column = MonthlyCategoryTotal.type
+    else:
+        if granularity == "week":
+            bucket = func.date(Transaction.date, "-6 days", "weekday 1")
+        else:
+            bucket = func.date(Transaction.date)
+        query = db.session.query(
+            bucket, Category.name, func.sum(Transaction.amount)
+        ).join(
+            transaction_categories, Transaction.id == transaction_categories.c.transaction_id
+        ).join(
+            Category, Category.id == transaction_categories.c.category_id
+        ).join(
+            user_transaction, Transaction.id == user_transaction.c.transaction_id
+        ).filter(
+            user_transaction.c.user_id == user_id,
+            Transaction.date >= start,
+            Transaction.date < end
+        )
+        type_column = Transaction.type
+
+    if transaction_type:
+        query = query.filter(type_column == transaction_type)
+    if category_name:
+        query = query.filter(Category.name == category_name)
+
+    return query.group_by(bucket, Category.name).all()
+
+
+def timeseries_totals(user_id, start, end, granularity, transaction_type=None, category_name=None):
+    buckets = {key: [] for key in bucket_keys(start, end, granularity)}
+    for key, category, total in _grouped_totals(user_id, start, end, granularity, transaction_type, category_name):
+        buckets.setdefault(key, []).append({"category": category, "total_amount": float(total or 0)})
+
+    return [
+        {
+            "bucket": key,
+            "total_amount": sum(item["total_amount"] for item in totals),
+            "categories": sorted(totals, key=lambda item: item["category"])
+        }
+        for key, totals in sorted(buckets.items())
+    ]
+
+
+@transactions_bp.route("/reports/timeseries", methods=["POST"])
+@swag_from({
+    "tags": ["Reports"],
+    "summary": "Get per-category totals over a range of months",
+    "description": "Returns per-bucket, per-category totals for every day, week (starting on Monday) or month between start_month and end_month inclusive, computed in one grouped query. Buckets without transactions are included with empty totals. Filters behave as in monthly_expenses.",
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "user_id": {"type": "integer", "example": 1},
+                    "start_month": {"type": "string", "description": "First month (YYYY-MM)", "example": "2024-03"},
+                    "end_month": {"type": "string", "description": "Last month (YYYY-MM)", "example": "2025-02"},
+                    "granularity": {"type": "string", "enum": ["day", "week", "month"], "default": "month"},
+                    "type": {"type": "string", "enum": ["expense", "revenue"], "example": "expense"},
+                    "category": {"type": "string", "example": "food"}
+                },
+                "required": ["user_id", "start_month", "end_month"]
+            }
+        }
+    ],
+    "responses": {
+        "200": {
+            "description": "Buckets in chronological order",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "granularity": {"type": "string"},
+                    "buckets": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "bucket": {"type": "string", "description": "YYYY-MM for months, YYYY-MM-DD for days and weeks"},
+                                "total_amount": {"type": "number"},
+                                "categories": {
+                                    "type": "array",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "category": {"type": "string"},
+                                            "total_amount": {"type": "number"}
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        "400": {"description": "Invalid input parameters"}
+    }
+})
+@reads_from_replica
+def timeseries_report():
+    data = request.get_json()
+    filters, error = report_filters(data)
+    if error:
+        return jsonify({"message": error}), 400
+    user_id, transaction_type, category_name = filters
+
+    granularity = data.get("granularity", "month")
+    if granularity not in GRANULARITIES:
+        return jsonify({"message": "Invalid granularity. Allowed: 'day', 'week', 'month'"}), 400
+
+    start, last, error = month_range(data.get("start_month"), data.get("end_month"))
+    if error:
+        return jsonify({"message": error}), 400
+
+    months = rollups.months_between(start, last)
+    if len(months) > MAX_TIMESERIES_MONTHS:
+        return jsonify({"message": f"At most {MAX_TIMESERIES_MONTHS} months per request"}), 400
+    end = _next_month(last)
+
+    buckets = report_cache.get_or_compute(
+        ["timeseries", user_id, months[0], months[-1], granularity, transaction_type, category_name],
+        [(user_id, month) for month in months],
+        lambda: timeseries_totals(user_id, start, end, granularity, transaction_type, category_name)
+    )
+    return jsonify({"granularity": granularity, "buckets": buckets})
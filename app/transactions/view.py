@@ -1,12 +1,33 @@
+import math
 from flask import request, jsonify
-from flasgger import swag_from
-from app import db
-from sqlalchemy import func
+from app.openapi import swag_from
+from app import db, report_cache
+from app.replica import reads_from_replica
+from app import versions
+from sqlalchemy import func, or_, and_, select
 from app.users.models import User
-from app.transactions.models import Transaction, transaction_categories, user_transaction
-from datetime import datetime, timedelta
-from app.transactions import transactions_bp
-from app.categories.models import Category
+from app.transactions.models import Transaction, MonthlyCategoryTotal, DailyTotal, user_transaction
+from datetime import datetime, timedelta, timezone
+from app.transactions import transactions_bp, rollups, search_index
+from app.categories.models import Category, transaction_categories
+from app.categories.cache import category_cache, resolve as resolve_categories
+from app.pagination import InvalidPageParams, decode_cursor, encode_cursor, parse_fields, parse_limit
+
+TRANSACTION_FIELDS = ["id", "amount", "type", "categories", "description", "date", "users"]
+SORT_OPTIONS = ["-date", "date", "-amount", "amount"]
+
+
+def parse_amount(value):
+    """The amount as a float, accepting numeric strings like "12.5"; None if it isn't a finite number."""
+    if isinstance(value, bool):
+        return None
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    return amount if math.isfinite(amount) else None
+
+
 @transactions_bp.route("/transactions", methods=["POST"])
 @swag_from({
     "tags": ["Transactions"],
@@ -43,6 +64,10 @@ from app.categories.models import Category
 def create_transaction():
     data = request.get_json()
 
+    amount = parse_amount(data.get("amount"))
+    if amount is None:
+        return jsonify({"message": "Amount must be a number"}), 400
+
     user_ids = data.get("user_ids", [])
     if not user_ids:
         return jsonify({"message": "At least one user is required"}), 400
@@ -65,7 +90,7 @@ def create_transaction():
     else:
         transaction_date = datetime.utcnow()
 
-    categories = Category.query.filter(Category.name.in_(categories_data)).all()
+    categories = resolve_categories(categories_data)
     if not categories:
         return jsonify({"message": "Invalid categories provided"}), 400
 
@@ -74,7 +99,7 @@ def create_transaction():
         return jsonify({"message": "No valid users found"}), 400
 
     transaction = Transaction(
-        amount=data["amount"],
+        amount=amount,
         type=transaction_type,
         description=data.get("description", ""),
         date=transaction_date
@@ -84,52 +109,238 @@ def create_transaction():
     transaction.categories.extend(categories)
 
     db.session.add(transaction)
+    rollups.add_transaction(transaction)
+    search_index.reindex_on_commit(transaction)
+    versions.bump(versions.TRANSACTIONS, *(versions.user_scope(user.id) for user in users))
     db.session.commit()
 
     return jsonify({"message": "Transaction created!", "transaction_id": transaction.id}), 201
 
 
 
+def transaction_columns(fields):
+    """The transactions columns needed to serialize `fields`; id and date are always read."""
+    columns = Transaction.__table__.c
+    return [columns.id, columns.date, *(
+        columns[field] for field in fields if field in ("amount", "type", "description")
+    )]
+
+
+def transaction_dicts(rows, fields):
+    """Serialize rows of transaction columns, looking up categories and users only if requested."""
+    ids = [row.id for row in rows]
+    categories = {transaction_id: [] for transaction_id in ids}
+    if "categories" in fields and ids:
+        for transaction_id, name in db.session.execute(
+            select(transaction_categories.c.transaction_id, Category.__table__.c.name)
+            .join(Category.__table__, Category.__table__.c.id == transaction_categories.c.category_id)
+            .where(transaction_categories.c.transaction_id.in_(ids))
+        ):
+            categories[transaction_id].append(name)
+    users = {transaction_id: [] for transaction_id in ids}
+    if "users" in fields and ids:
+        for transaction_id, user_id in db.session.execute(
+            select(user_transaction.c.transaction_id, user_transaction.c.user_id)
+            .where(user_transaction.c.transaction_id.in_(ids))
+        ):
+            users[transaction_id].append(user_id)
+
+    transactions = []
+    for row in rows:
+        values = row._mapping
+        transaction = {}
+        for field in fields:
+            if field == "categories":
+                transaction[field] = categories[row.id]
+            elif field == "users":
+                transaction[field] = users[row.id]
+            elif field == "date":
+                transaction[field] = row.date.isoformat()
+            else:
+                transaction[field] = values[field]
+        transactions.append(transaction)
+
+    return transactions
+
+
+def _parse_bound(value, end=False):
+    """A naive UTC datetime from YYYY-MM-DD or an ISO datetime; a bare end date includes the whole day."""
+    bound = datetime.fromisoformat(value)
+    if bound.tzinfo is not None:
+        bound = bound.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and len(value) == 10:
+        bound += timedelta(days=1)
+    return bound
+
+
+def transaction_filters(args):
+    """Compile the list filters into WHERE clauses. Returns (clauses, error)."""
+    columns = Transaction.__table__.c
+    clauses = []
+
+    user_id = args.get("user_id")
+    if user_id is not None:
+        try:
+            user_id = int(user_id)
+        except ValueError:
+            return None, "user_id must be an integer"
+        clauses.append(columns.id.in_(
+            select(user_transaction.c.transaction_id).where(user_transaction.c.user_id == user_id)
+        ))
+
+    transaction_type = args.get("type")
+    if transaction_type is not None:
+        if transaction_type not in ("expense", "revenue"):
+            return None, "Invalid transaction type. Allowed: 'expense', 'revenue'"
+        clauses.append(columns.type == transaction_type)
+
+    names = [name for value in args.getlist("category") for name in value.split(",") if name]
+    if names:
+        category_match = args.get("category_match", "any")
+        if category_match not in ("any", "all"):
+            return None, "category_match must be 'any' or 'all'"
+        ids = category_cache().ids_for(names)
+        unknown = sorted(set(names).difference(ids))
+        if unknown:
+            return None, f"Unknown categories: {', '.join(unknown)}"
+        links = select(transaction_categories.c.transaction_id).where(
+            transaction_categories.c.category_id.in_(set(ids.values()))
+        )
+        if category_match == "all":
+            links = links.group_by(transaction_categories.c.transaction_id).having(
+                func.count() == len(set(ids.values()))
+            )
+        clauses.append(columns.id.in_(links))
+
+    try:
+        if args.get("start_date"):
+            clauses.append(columns.date >= _parse_bound(args["start_date"]))
+        if args.get("end_date"):
+            clauses.append(columns.date < _parse_bound(args["end_date"], end=True))
+    except ValueError:
+        return None, "Invalid date. Use 'YYYY-MM-DD' or 'YYYY-MM-DDTHH:MM:SS'"
+
+    amounts = {}
+    for name in ("min_amount", "max_amount"):
+        if args.get(name):
+            amounts[name] = parse_amount(args[name])
+            if amounts[name] is None:
+                return None, "min_amount and max_amount must be numbers"
+    if "min_amount" in amounts:
+        clauses.append(columns.amount >= amounts["min_amount"])
+    if "max_amount" in amounts:
+        clauses.append(columns.amount <= amounts["max_amount"])
+
+    return clauses, None
+
+
 @transactions_bp.route("/transactions", methods=["GET"])
 @swag_from({
     "tags": ["Transactions"],
-    "summary": "Get all transactions",
-    "description": "Retrieves all transactions with details",
+    "summary": "Get transactions page by page",
+    "description": "Retrieves transactions with details, newest first unless sort says otherwise. All filters are combined with AND into one query. Pass the returned next_cursor, with the same filters and sort, to fetch the following page. Only the columns named in fields are read; categories and users are only looked up when requested.",
+    "parameters": [
+        {"name": "user_id", "in": "query", "required": False, "type": "integer", "description": "Only transactions of this user"},
+        {"name": "type", "in": "query", "required": False, "type": "string", "enum": ["expense", "revenue"]},
+        {"name": "category", "in": "query", "required": False, "type": "string", "description": "Category names, comma-separated or repeated", "example": "food,rent"},
+        {"name": "category_match", "in": "query", "required": False, "type": "string", "enum": ["any", "all"], "description": "Match any (default) or all of the categories"},
+        {"name": "start_date", "in": "query", "required": False, "type": "string", "description": "From this date or datetime, inclusive; datetimes with an offset are converted to UTC", "example": "2025-02-01"},
+        {"name": "end_date", "in": "query", "required": False, "type": "string", "description": "Up to this date (whole day) or datetime, inclusive", "example": "2025-02-28"},
+        {"name": "min_amount", "in": "query", "required": False, "type": "number"},
+        {"name": "max_amount", "in": "query", "required": False, "type": "number"},
+        {"name": "sort", "in": "query", "required": False, "type": "string", "enum": SORT_OPTIONS, "description": "Sort order, '-' for descending (default -date)"},
+        {"name": "limit", "in": "query", "required": False, "type": "integer", "description": "Page size (default 100, max 1000)"},
+        {"name": "cursor", "in": "query", "required": False, "type": "string", "description": "Opaque cursor from a previous page"},
+        {"name": "fields", "in": "query", "required": False, "type": "string", "description": "Comma-separated subset of id, amount, type, categories, description, date, users (default: all)", "example": "id,amount,date"}
+    ],
     "responses": {
         "200": {
-            "description": "List of transactions",
+            "description": "Page of transactions",
             "schema": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "id": {"type": "integer"},
-                        "amount": {"type": "number"},
-                        "type": {"type": "string"},
-                        "categories": {"type": "array", "items": {"type": "string"}},
-                        "description": {"type": "string"},
-                        "date": {"type": "string"},
-                        "users": {"type": "array", "items": {"type": "integer"}}
-                    }
+                "type": "object",
+                "properties": {
+                    "transactions": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "integer"},
+                                "amount": {"type": "number"},
+                                "type": {"type": "string"},
+                                "categories": {"type": "array", "items": {"type": "string"}},
+                                "description": {"type": "string"},
+                                "date": {"type": "string"},
+                                "users": {"type": "array", "items": {"type": "integer"}}
+                            }
+                        }
+                    },
+                    "next_cursor": {"type": "string", "description": "Cursor of the next page, null on the last page"}
                 }
             }
-        }
+        },
+        "400": {"description": "Invalid filter, sort, limit, cursor or fields"}
     }
 })
+@reads_from_replica
+@versions.conditional(versions.TRANSACTIONS)
 def get_transactions():
-    transactions = Transaction.query.all()
-    return jsonify([
-        {
-            "id": t.id,
-            "amount": t.amount,
-            "type": t.type,
-            "categories": [category.name for category in t.categories],
-            "description": t.description,
-            "date": t.date.isoformat(),
-            "users": [u.id for u in t.users]
-        }
-        for t in transactions
-    ])
+    try:
+        fields = parse_fields(request.args.get("fields"), TRANSACTION_FIELDS)
+    except InvalidPageParams as e:
+        return jsonify({"message": str(e)}), 400
+    sort = request.args.get("sort", "-date")
+    if sort not in SORT_OPTIONS:
+        return jsonify({"message": f"Invalid sort. Allowed: {', '.join(SORT_OPTIONS)}"}), 400
+    filters, error = transaction_filters(request.args)
+    if error:
+        return jsonify({"message": error}), 400
+
+    # Only indexed columns are sortable; SQLite indexes end in the rowid, so
+    # ties on the sort column are already ordered by id.
+    columns = Transaction.__table__.c
+    descending = sort.startswith("-")
+    sort_column = columns[sort.lstrip("-")]
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        cursor = request.args.get("cursor")
+        if cursor:
+            cursor_sort, cursor_value, cursor_id = decode_cursor(cursor)
+            if cursor_sort != sort:
+                raise InvalidPageParams("Cursor belongs to another sort order")
+            cursor_value = datetime.fromisoformat(cursor_value) if sort_column is columns.date else float(cursor_value)
+            cursor_id = int(cursor_id)
+    except (InvalidPageParams, TypeError, ValueError):
+        return jsonify({"message": "Invalid limit or cursor"}), 400
+
+    # Plain rows rather than ORM objects: only the requested columns are read
+    # and nothing goes through the identity map.
+    selected = transaction_columns(fields)
+    if sort_column is columns.amount and "amount" not in fields:
+        selected.append(columns.amount)
+    query = select(*selected).where(*filters)
+    if cursor:
+        if descending:
+            after = or_(sort_column < cursor_value, and_(sort_column == cursor_value, columns.id < cursor_id))
+        else:
+            after = or_(sort_column > cursor_value, and_(sort_column == cursor_value, columns.id > cursor_id))
+        query = query.where(after)
+    if descending:
+        query = query.order_by(sort_column.desc(), columns.id.desc())
+    else:
+        query = query.order_by(sort_column, columns.id)
+    rows = db.session.execute(query.limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]._mapping
+        value = last[sort_column.name]
+        next_cursor = encode_cursor(sort, value.isoformat() if sort_column is columns.date else value, last["id"])
+
+    return jsonify({
+        "transactions": transaction_dicts(rows, fields),
+        "next_cursor": next_cursor
+    })
 
 
 @transactions_bp.route("/transactions/<int:transaction_id>", methods=["GET"])
@@ -145,20 +356,14 @@ def get_transactions():
         "404": {"description": "Transaction not found"}
     }
 })
+@reads_from_replica
+@versions.conditional(versions.TRANSACTIONS)
 def get_transaction(transaction_id):
     transaction = Transaction.query.get(transaction_id)
     if not transaction:
         return jsonify({"message": "Transaction not found"}), 404
 
-    return jsonify({
-        "id": transaction.id,
-        "amount": transaction.amount,
-        "type": transaction.type,
-        "categories": [category.name for category in transaction.categories],
-        "description": transaction.description,
-        "date": transaction.date.isoformat(),
-        "users": [user.id for user in transaction.users]
-    })
+    return jsonify(transaction.to_dict())
 
 @transactions_bp.route("/transactions/<int:transaction_id>", methods=["PUT"])
 @swag_from({
@@ -190,7 +395,7 @@ def get_transaction(transaction_id):
     ],
     "responses": {
         "200": {"description": "Transaction updated successfully"},
-        "400": {"description": "Invalid transaction type"},
+        "400": {"description": "Invalid transaction type or amount"},
         "404": {"description": "Transaction not found"}
     }
 })
@@ -205,7 +410,15 @@ def update_transaction(transaction_id):
     if "type" in data and data["type"] not in valid_types:
         return jsonify({"message": "Invalid transaction type. Allowed: 'expense', 'revenue'"}), 400
 
-    transaction.amount = data.get("amount", transaction.amount)
+    amount = parse_amount(data["amount"]) if "amount" in data else transaction.amount
+    if amount is None:
+        return jsonify({"message": "Amount must be a number"}), 400
+
+    deltas = rollups.new_deltas()
+    rollups.collect_transaction(deltas, transaction, sign=-1)
+    previous_user_ids = [user.id for user in transaction.users]
+
+    transaction.amount = amount
     transaction.type = data.get("type", transaction.type)
     transaction.description = data.get("description", transaction.description)
 
@@ -217,14 +430,20 @@ def update_transaction(transaction_id):
 
     categories_data = data.get("categories", [])
     if categories_data:
-        categories = Category.query.filter(Category.name.in_(categories_data)).all()
-        transaction.categories = categories
+        transaction.categories = resolve_categories(categories_data)
 
     user_ids = data.get("user_ids", [])
     if user_ids:
         users = User.query.filter(User.id.in_(user_ids)).all()
         transaction.users = users
 
+    rollups.collect_transaction(deltas, transaction)
+    rollups.apply_deltas(deltas)
+    search_index.reindex_on_commit(transaction)
+    versions.bump(
+        versions.TRANSACTIONS,
+        *(versions.user_scope(user_id) for user_id in previous_user_ids + [user.id for user in transaction.users])
+    )
     db.session.commit()
     return jsonify({"message": "Transaction updated!"})
 
@@ -247,10 +466,75 @@ def delete_transaction(transaction_id):
     if not transaction:
         return jsonify({"message": "Transaction not found"}), 404
 
+    rollups.remove_transaction(transaction)
+    search_index.reindex_on_commit(transaction.id)
+    versions.bump(versions.TRANSACTIONS, *(versions.user_scope(user.id) for user in transaction.users))
     db.session.delete(transaction)
     db.session.commit()
     return jsonify({"message": "Transaction deleted!"})
 
+def report_filters(data):
+    """Validate the user_id, type and category the per-user reports share.
+
+    Returns ((user_id, transaction_type, category_name), error).
+    """
+    if not data:
+        return None, "Request body is required"
+
+    user_id = data.get("user_id")
+    if user_id is None:
+        return None, "User ID parameter is required"
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None, "User ID must be an integer"
+
+    transaction_type = data.get("type")
+    if transaction_type and transaction_type not in ['expense', 'revenue']:
+        return None, "Invalid transaction type. Must be 'expense' or 'revenue'"
+
+    return (user_id, transaction_type, data.get("category")), None
+
+
+def month_range(first, last):
+    """The first days of two YYYY-MM months, in order. Returns (start, last, error)."""
+    try:
+        start = datetime.strptime(first or "", "%Y-%m")
+        last = datetime.strptime(last or "", "%Y-%m")
+    except (TypeError, ValueError):
+        return None, None, "Invalid month format. Use YYYY-MM"
+    if last < start:
+        return None, None, "end_month must not be before start_month"
+    return start, last, None
+
+
+def _monthly_totals(user_id, month, transaction_type=None, category_name=None):
+    query = db.session.query(
+        Category.name,
+        func.sum(MonthlyCategoryTotal.total_amount).label('total_amount')
+    ).join(
+        Category,
+        Category.id == MonthlyCategoryTotal.category_id
+    ).filter(
+        MonthlyCategoryTotal.user_id == user_id,
+        MonthlyCategoryTotal.month == month,
+        MonthlyCategoryTotal.transaction_count > 0
+    )
+
+    if transaction_type:
+        query = query.filter(MonthlyCategoryTotal.type == transaction_type)
+
+    if category_name:
+        query = query.filter(Category.name == category_name)
+
+    query = query.group_by(Category.name)
+
+    return [{
+        "category": row[0],
+        "total_amount": float(row[1]) if row[1] is not None else 0
+    } for row in query.all()]
+
+
 @transactions_bp.route("/reports/monthly_expenses", methods=["POST"])
 @swag_from({
     "tags": ["Reports"],
@@ -318,68 +602,27 @@ def delete_transaction(transaction_id):
         }
     }
 })
+@reads_from_replica
 def monthly_expenses():
     data = request.get_json()
-    if not data:
-        return jsonify({"message": "Request body is required"}), 400
+    filters, error = report_filters(data)
+    if error:
+        return jsonify({"message": error}), 400
+    user_id, transaction_type, category_name = filters
 
     month = data.get("month")
     if not month:
         return jsonify({"message": "Month parameter is required"}), 400
-
-    user_id = data.get("user_id")
-    if user_id is None:
-        return jsonify({"message": "User ID parameter is required"}), 400
-
-    transaction_type = data.get("type")
-    category_name = data.get("category")
-
-    if transaction_type and transaction_type not in ['expense', 'revenue']:
-        return jsonify({"message": "Invalid transaction type. Must be 'expense' or 'revenue'"}), 400
-
-    try:
-        month_start = datetime.strptime(month, "%Y-%m")
-        if month_start.month == 12:
-            month_end = month_start.replace(year=month_start.year + 1, month=1, day=1)
-        else:
-            month_end = month_start.replace(month=month_start.month + 1, day=1)
-        month_end = month_end - timedelta(microseconds=1)
-        
-    except ValueError as e:
-        return jsonify({"message": "Invalid month format"}), 400
+    month_start, _, error = month_range(month, month)
+    if error:
+        return jsonify({"message": error}), 400
+    month = rollups.month_key(month_start)
     try:
-        query = db.session.query(
-            Category.name,
-            func.sum(Transaction.amount).label('total_amount')
-        ).join(
-            transaction_categories,
-            Transaction.id == transaction_categories.c.transaction_id
-        ).join(
-            Category,
-            Category.id == transaction_categories.c.category_id
-        ).join(
-            user_transaction,
-            Transaction.id == user_transaction.c.transaction_id
-        ).filter(
-            Transaction.date >= month_start,
-            Transaction.date <= month_end,
-            user_transaction.c.user_id == user_id
+        result = report_cache.get_or_compute(
+            ["monthly_expenses", user_id, month, transaction_type, category_name],
+            [(user_id, month)],
+            lambda: _monthly_totals(user_id, month, transaction_type, category_name)
         )
-
-        if transaction_type:
-            query = query.filter(Transaction.type == transaction_type)
-
-        if category_name:
-            query = query.filter(Category.name == category_name)
-
-        query = query.group_by(Category.name)
-
-        transactions = query.all()
-        result = [{
-            "category": transaction[0],
-            "total_amount": float(transaction[1]) if transaction[1] is not None else 0
-        } for transaction in transactions]
-
         return jsonify(result)
     
     except Exception as e:
@@ -389,6 +632,21 @@ def monthly_expenses():
         }), 500
     
 
+def _daily_totals(user_id, transaction_type, start_day, end_day):
+    days = DailyTotal.query.filter(
+        DailyTotal.user_id == user_id,
+        DailyTotal.type == transaction_type,
+        DailyTotal.day >= start_day,
+        DailyTotal.day <= end_day,
+        DailyTotal.transaction_count > 0
+    ).order_by(DailyTotal.day).all()
+
+    return [
+        {"date": d.day, "total_amount": d.total_amount}
+        for d in days
+    ]
+
+
 @transactions_bp.route("/reports/daily_expenses", methods=["POST"])
 @swag_from({
     "tags": ["Reports"],
@@ -429,6 +687,7 @@ def monthly_expenses():
         "404": {"description": "User not found"}
     }
 })
+@reads_from_replica
 def daily_expenses():
     data = request.get_json()
 
@@ -461,21 +720,184 @@ def daily_expenses():
     except ValueError:
         return jsonify({"message": "Invalid date format. Use YYYY-MM-DD"}), 400
 
-    transactions = db.session.query(
-        func.date(Transaction.date).label("transaction_date"),
-        func.sum(Transaction.amount).label("total_amount")
-    ).join(Transaction.users).filter(
-        Transaction.type == transaction_type,
-        Transaction.date >= start_date,
-        Transaction.date <= end_date,
-        User.id == user_id
-    ).group_by(
-        func.date(Transaction.date)
-    ).order_by(
-        func.date(Transaction.date)
-    ).all()
-
-    return jsonify([
-        {"date": str(t.transaction_date), "total_amount": t.total_amount}
-        for t in transactions
-    ])
\ No newline at end of file
+    start_day = rollups.day_key(start_date)
+    end_day = rollups.day_key(end_date)
+    result = report_cache.get_or_compute(
+        ["daily_expenses", user.id, transaction_type, start_day, end_day],
+        [(user.id, month) for month in rollups.months_between(start_date, end_date)],
+        lambda: _daily_totals(user.id, transaction_type, start_day, end_day)
+    )
+    return jsonify(result)
+
+
+@transactions_bp.route("/reports/range_total", methods=["POST"])
+@swag_from({
+    "tags": ["Reports"],
+    "summary": "Get the total expenses/revenues of a user over a date range",
+    "description": "Returns the sum and number of transactions of one type between two dates. The answer is read from two prefix sums, so its cost does not depend on the length of the range.",
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "user_id": {"type": "integer", "example": 1},
+                    "type": {"type": "string", "enum": ["expense", "revenue"], "example": "expense"},
+                    "start_date": {"type": "string", "description": "Start date (YYYY-MM-DD)", "example": "2025-01-01"},
+                    "end_date": {"type": "string", "description": "End date (YYYY-MM-DD)", "example": "2025-12-31"}
+                },
+                "required": ["user_id", "type", "start_date", "end_date"]
+            }
+        }
+    ],
+    "responses": {
+        "200": {
+            "description": "Range total",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "total_amount": {"type": "number"},
+                    "transaction_count": {"type": "integer"}
+                }
+            }
+        },
+        "400": {"description": "Invalid input, missing parameters, incorrect format, or start_date after end_date"},
+        "404": {"description": "User not found"}
+    }
+})
+@reads_from_replica
+def range_total():
+    data = request.get_json()
+
+    if not data:
+        return jsonify({"message": "Request body must be JSON"}), 400
+
+    user_id = data.get("user_id")
+    transaction_type = data.get("type")
+    start_date = data.get("start_date")
+    end_date = data.get("end_date")
+
+    if not user_id or not transaction_type or not start_date or not end_date:
+        return jsonify({"message": "user_id, type, start_date and end_date are required"}), 400
+
+    if transaction_type not in ["expense", "revenue"]:
+        return jsonify({"message": "Invalid transaction type. Allowed values: 'expense', 'revenue'"}), 400
+
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({"message": "User not found"}), 404
+
+    try:
+        start_date = datetime.strptime(start_date, "%Y-%m-%d")
+        end_date = datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError:
+        return jsonify({"message": "Invalid date format. Use YYYY-MM-DD"}), 400
+
+    if start_date > end_date:
+        return jsonify({"message": "start_date must not be after end_date"}), 400
+
+    start_day = rollups.day_key(start_date)
+    end_day = rollups.day_key(end_date)
+
+    def compute():
+        total_amount, transaction_count = rollups.daily_range_total(user.id, transaction_type, start_day, end_day)
+        return {
+            "user_id": user.id,
+            "type": transaction_type,
+            "start_date": start_day,
+            "end_date": end_day,
+            "total_amount": total_amount,
+            "transaction_count": transaction_count
+        }
+
+    result = report_cache.get_or_compute(
+        ["range_total", user.id, transaction_type, start_day, end_day],
+        [(user.id, month) for month in rollups.months_between(start_date, end_date)],
+        compute
+    )
+    return jsonify(result)
+
+
+@transactions_bp.route("/users/<int:user_id>/balance", methods=["GET"])
+@swag_from({
+    "tags": ["Reports"],
+    "summary": "Get the balance of a user",
+    "description": "Returns revenue minus expenses of the user's transactions, now or at the end of a given day. It is read from the running totals of the daily aggregates, which every transaction write keeps current, so the cost does not depend on the length of the user's history.",
+    "parameters": [
+        {"name": "user_id", "in": "path", "required": True, "type": "integer"},
+        {"name": "date", "in": "query", "required": False, "type": "string", "description": "Balance at the end of this day (YYYY-MM-DD); current balance if omitted", "example": "2025-06-30"}
+    ],
+    "responses": {
+        "200": {
+            "description": "Balance",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "user_id": {"type": "integer"},
+                    "date": {"type": "string"},
+                    "balance": {"type": "number"},
+                    "revenue": {"type": "number"},
+                    "expenses": {"type": "number"},
+                    "transaction_count": {"type": "integer"},
+                    "last_transaction_day": {"type": "string"}
+                }
+            }
+        },
+        "400": {"description": "Invalid date format"},
+        "404": {"description": "User not found"}
+    }
+})
+@reads_from_replica
+@versions.conditional(versions.user_scope)
+def get_balance(user_id):
+    day = request.args.get("date")
+    if day:
+        try:
+            day = rollups.day_key(datetime.strptime(day, "%Y-%m-%d"))
+        except ValueError:
+            return jsonify({"message": "Invalid date format. Use YYYY-MM-DD"}), 400
+
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({"message": "User not found"}), 404
+
+    totals = rollups.balance_through(user.id, day or None)
+    revenue, revenue_count, revenue_day = totals["revenue"]
+    expenses, expense_count, expense_day = totals["expense"]
+    return jsonify({
+        "user_id": user.id,
+        "date": day or None,
+        "balance": revenue - expenses,
+        "revenue": revenue,
+        "expenses": expenses,
+        "transaction_count": revenue_count + expense_count,
+        "last_transaction_day": max(filter(None, [revenue_day, expense_day]), default=None)
+    })
+
+
+@transactions_bp.route("/reports/cache_stats", methods=["GET"])
+@swag_from({
+    "tags": ["Reports"],
+    "summary": "Get report cache statistics",
+    "description": "Returns the report cache backend, its size and the hit, miss and eviction counters of this worker process.",
+    "responses": {
+        "200": {
+            "description": "Cache statistics",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "backend": {"type": "string"},
+                    "entries": {"type": "integer"},
+                    "hits": {"type": "integer"},
+                    "misses": {"type": "integer"},
+                    "evictions": {"type": "integer"},
+                    "hit_rate": {"type": "number"}
+                }
+            }
+        }
+    }
+})
+def report_cache_stats():
+    return jsonify(report_cache.stats())
@@ -1,4 +1,4 @@
 from flask import Blueprint
 
-users_bp=Blueprint("user_name", __name__)
-from . import view
+users_bp=Blueprint("user_name", __name__, cli_group="users")
+from . import view, bulk
\ No newline at end of file
@@ -0,0 +1,177 @@
+import csv
+import json
+import click
+from flask import request, jsonify
+from sqlalchemy import insert, or_
+from app.openapi import swag_from
+from app import db, versions, password_hasher
+from app.batching import batches
+from app.users.models import User
+from app.users import users_bp
+
+MAX_BULK_USERS = 10000
+
+
+def _text(record, field, max_length, required=True):
+    value = record.get(field)
+    if value is None and not required:
+        return None, None
+    if not isinstance(value, str) or (required and not value):
+        return None, f"{field} is required"
+    if len(value) > max_length:
+        return None, f"{field} must be at most {max_length} characters"
+    return value, None
+
+
+def _validate_record(record):
+    if not isinstance(record, dict):
+        return None, "Record must be an object"
+    row = {}
+    for field, max_length, required in (("username", 20, True), ("email", 120, True), ("about_me", 500, False)):
+        row[field], error = _text(record, field, max_length, required)
+        if error:
+            return None, error
+    password = record.get("password")
+    if not isinstance(password, str) or not password:
+        return None, "password is required"
+    row["about_me"] = row["about_me"] or ""
+    return (row, password), None
+
+
+def create_users(records):
+    """Validate, hash and insert users in one transaction.
+
+    Returns ([{"index", "user_id"}], [{"index", "message"}]). Emails and
+    usernames are checked against the table in one query and against
+    earlier records of the same batch.
+    """
+    errors = []
+    valid = []
+    for index, record in enumerate(records):
+        parsed, error = _validate_record(record)
+        if error:
+            errors.append({"index": index, "message": error})
+        else:
+            valid.append((index, *parsed))
+
+    emails = {row["email"] for _, row, _ in valid}
+    usernames = {row["username"] for _, row, _ in valid}
+    taken_emails = set()
+    taken_usernames = set()
+    if valid:
+        for email, username in db.session.query(User.email, User.username).filter(
+            or_(User.email.in_(emails), User.username.in_(usernames))
+        ):
+            taken_emails.add(email)
+            taken_usernames.add(username)
+
+    accepted = []
+    for index, row, password in valid:
+        if row["email"] in taken_emails:
+            errors.append({"index": index, "message": "Email already exists"})
+        elif row["username"] in taken_usernames:
+            errors.append({"index": index, "message": "Username already exists"})
+        else:
+            taken_emails.add(row["email"])
+            taken_usernames.add(row["username"])
+            accepted.append((index, row, password))
+    errors.sort(key=lambda error: error["index"])
+
+    if not accepted:
+        return [], errors
+
+    hashes = password_hasher.hash_many([password for _, _, password in accepted])
+    rows = [dict(row, password_hash=password_hash) for (_, row, _), password_hash in zip(accepted, hashes)]
+
+    user_ids = []
+    for batch in batches(rows):
+        result = db.session.execute(
+            insert(User.__table__).returning(User.__table__.c.id, sort_by_parameter_order=True),
+            batch
+        )
+        user_ids.extend(result.scalars().all())
+
+    versions.bump(versions.USERS)
+    db.session.commit()
+    return [{"index": index, "user_id": user_id} for (index, _, _), user_id in zip(accepted, user_ids)], errors
+
+
+@users_bp.route("/users/bulk", methods=["POST"])
+@swag_from({
+    "tags": ["Users"],
+    "summary": "Create many users at once",
+    "description": "Checks every email and username for conflicts in one query, hashes the passwords in parallel on a process pool sized to the CPU count and inserts the valid users in a single database transaction. Invalid or conflicting records are reported by their index and skipped.",
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "users": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "username": {"type": "string"},
+                                "email": {"type": "string"},
+                                "password": {"type": "string"},
+                                "about_me": {"type": "string"}
+                            },
+                            "required": ["username", "email", "password"]
+                        }
+                    }
+                },
+                "required": ["users"]
+            }
+        }
+    ],
+    "responses": {
+        "201": {"description": "Valid records were created; per-record errors are listed"},
+        "400": {"description": "Invalid request or no valid records"},
+        "503": {"description": "Another bulk import is hashing passwords in this worker"}
+    }
+})
+def bulk_create_users():
+    data = request.get_json()
+    records = data.get("users") if isinstance(data, dict) else None
+    if not isinstance(records, list) or not records:
+        return jsonify({"message": "A non-empty 'users' list is required"}), 400
+    if len(records) > MAX_BULK_USERS:
+        return jsonify({"message": f"At most {MAX_BULK_USERS} users per request"}), 400
+
+    created, errors = create_users(records)
+    if not created:
+        return jsonify({"message": "No valid users", "created": 0, "errors": errors}), 400
+
+    return jsonify({
+        "message": "Users created!",
+        "created": len(created),
+        "users": created,
+        "errors": errors
+    }), 201
+
+
+def _read_records(path):
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            return list(csv.DictReader(f))
+        content = f.read().strip()
+        if content.startswith("["):
+            return json.loads(content)
+        return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+@users_bp.cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--workers", type=int, default=None, help="Hashing processes (default: PASSWORD_HASH_BULK_WORKERS or CPU count).")
+def import_users_command(path, workers):
+    """Create users from a CSV (username,email,password,about_me), JSON array or NDJSON file."""
+    if workers:
+        password_hasher.bulk_workers = workers
+    records = _read_records(path)
+    created, errors = create_users(records)
+    for error in errors:
+        click.echo(f"record {error['index']}: {error['message']}", err=True)
+    click.echo(f"Created {len(created)} users, skipped {len(errors)}.")
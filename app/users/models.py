@@ -1,4 +1,4 @@
-from app import db, bcrypt
+from app import db, password_hasher
 
 class User( db.Model):
     __tablename__ = "users"
@@ -19,7 +19,11 @@ class User( db.Model):
         self.about_me = about_me 
 
     def set_password(self, password):
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
\ No newline at end of file
+        """Check the password, upgrading the stored hash if the cost factor changed."""
+        matches, new_hash = password_hasher.verify(self.password_hash, password)
+        if new_hash:
+            self.password_hash = new_hash
+        return matches
\ No newline at end of file
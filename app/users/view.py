@@ -1,8 +1,14 @@
 from flask import request, jsonify
-from flasgger import swag_from
+from sqlalchemy import select
+from app.openapi import swag_from
 from app import db
+from app.replica import reads_from_replica
+from app import versions
 from app.users.models import User
 from app.users import users_bp
+from app.pagination import InvalidPageParams, decode_cursor, encode_cursor, parse_fields, parse_limit
+
+USER_FIELDS = ["id", "username", "email", "about_me"]
 @users_bp.route("/users", methods=["POST"])
 @swag_from({
     "tags": ["Users"],
@@ -44,6 +50,7 @@ def create_user():
     )
 
     db.session.add(user)
+    versions.bump(versions.USERS)
     db.session.commit()
 
     return jsonify({
@@ -54,32 +61,68 @@ def create_user():
 @users_bp.route("/users", methods=["GET"])
 @swag_from({
     "tags": ["Users"],
-    "summary": "Get all users",
-    "description": "Retrieves a list of all users.",
+    "summary": "Get users page by page",
+    "description": "Retrieves users ordered by ID. Pass the returned next_cursor to fetch the following page. Only the columns named in fields are read.",
+    "parameters": [
+        {"name": "limit", "in": "query", "required": False, "type": "integer", "description": "Page size (default 100, max 1000)"},
+        {"name": "cursor", "in": "query", "required": False, "type": "string", "description": "Opaque cursor from a previous page"},
+        {"name": "fields", "in": "query", "required": False, "type": "string", "description": "Comma-separated subset of id, username, email, about_me (default: all)", "example": "id,username"}
+    ],
     "responses": {
         "200": {
-            "description": "A list of users",
+            "description": "Page of users",
             "schema": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "id": {"type": "integer"},
-                        "username": {"type": "string"},
-                        "email": {"type": "string"},
-                        "about_me": {"type": "string"}
-                    }
+                "type": "object",
+                "properties": {
+                    "users": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "integer"},
+                                "username": {"type": "string"},
+                                "email": {"type": "string"},
+                                "about_me": {"type": "string"}
+                            }
+                        }
+                    },
+                    "next_cursor": {"type": "string", "description": "Cursor of the next page, null on the last page"}
                 }
             }
-        }
+        },
+        "400": {"description": "Invalid limit, cursor or fields"}
     }
 })
+@reads_from_replica
+@versions.conditional(versions.USERS)
 def get_users():
-    users = User.query.all()
-    return jsonify([
-        {"id": user.id, "username": user.username, "email": user.email, "about_me": user.about_me}
-        for user in users
-    ])
+    try:
+        fields = parse_fields(request.args.get("fields"), USER_FIELDS)
+    except InvalidPageParams as e:
+        return jsonify({"message": str(e)}), 400
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        cursor = request.args.get("cursor")
+        if cursor:
+            cursor_id = int(decode_cursor(cursor)[0])
+    except (InvalidPageParams, IndexError, TypeError, ValueError):
+        return jsonify({"message": "Invalid limit or cursor"}), 400
+
+    columns = User.__table__.c
+    query = select(columns.id, *(columns[field] for field in fields if field != "id"))
+    if cursor:
+        query = query.where(columns.id > cursor_id)
+    rows = db.session.execute(query.order_by(columns.id).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id)
+
+    return jsonify({
+        "users": [{field: row._mapping[field] for field in fields} for row in rows],
+        "next_cursor": next_cursor
+    })
 
 
 @users_bp.route("/users/<int:user_id>", methods=["GET"])
@@ -112,6 +155,8 @@ def get_users():
         "404": {"description": "User not found"}
     }
 })
+@reads_from_replica
+@versions.conditional(versions.user_scope)
 def get_user(user_id):
     user = User.query.get(user_id)
     if not user:
@@ -175,8 +220,9 @@ def update_user(user_id):
     if "about_me" in data:
         user.about_me = data["about_me"]
     if "password" in data:
-        user.password_hash = data["password"]
+        user.set_password(data["password"])
 
+    versions.bump(versions.USERS, versions.user_scope(user.id))
     db.session.commit()
     return jsonify({"message": "User updated successfully!"})
 
@@ -205,6 +251,61 @@ def delete_user(user_id):
     if not user:
         return jsonify({"message": "User not found"}), 404
 
+    from app.transactions import rollups, search_index
+    from app.transactions.models import user_transaction
+    rollups.forget_user(user.id)
+    search_index.reindex_on_commit(*db.session.execute(
+        select(user_transaction.c.transaction_id).where(user_transaction.c.user_id == user.id)
+    ).scalars())
+    versions.bump(versions.USERS, versions.TRANSACTIONS, versions.user_scope(user.id))
     db.session.delete(user)
     db.session.commit()
     return jsonify({"message": "User deleted successfully!"})
+
+
+@users_bp.route("/users/<int:user_id>/verify_password", methods=["POST"])
+@swag_from({
+    "tags": ["Users"],
+    "summary": "Check a user's password",
+    "description": "Verifies the password against the stored bcrypt hash on the hashing pool. If it matches and the hash was made with a different cost factor than BCRYPT_LOG_ROUNDS, the hash is upgraded.",
+    "parameters": [
+        {
+            "name": "user_id",
+            "in": "path",
+            "type": "integer",
+            "required": True,
+            "description": "User ID"
+        },
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "password": {"type": "string"}
+                },
+                "required": ["password"]
+            }
+        }
+    ],
+    "responses": {
+        "200": {"description": "Whether the password matches", "schema": {"type": "object", "properties": {"valid": {"type": "boolean"}}}},
+        "400": {"description": "Password is required"},
+        "404": {"description": "User not found"},
+        "503": {"description": "Hashing pool is saturated, retry later"}
+    }
+})
+def verify_password(user_id):
+    data = request.get_json()
+    if not data or not isinstance(data.get("password"), str):
+        return jsonify({"message": "Password is required"}), 400
+
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({"message": "User not found"}), 404
+
+    valid = user.check_password(data["password"])
+    if db.session.is_modified(user):
+        db.session.commit()
+    return jsonify({"valid": valid})
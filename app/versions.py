@@ -0,0 +1,69 @@
+import functools
+from flask import make_response, request
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as upsert
+from app import db
+
+USERS = "users"
+CATEGORIES = "categories"
+TRANSACTIONS = "transactions"
+
+
+class DataVersion(db.Model):
+    """A counter per table, or per user, bumped by every write to it."""
+    __tablename__ = "data_versions"
+    scope = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+def user_scope(user_id):
+    return f"user:{user_id}"
+
+
+def bump(*scopes):
+    """Increment the counters in the current transaction, creating missing ones."""
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    table = DataVersion.__table__
+    statement = upsert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.scope],
+        set_={"version": table.c.version + 1}
+    )
+    db.session.execute(statement, [{"scope": scope, "version": 1} for scope in scopes])
+
+
+def current(scopes):
+    rows = db.session.execute(
+        select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_(scopes))
+    )
+    found = dict(rows.all())
+    return [found.get(scope, 0) for scope in scopes]
+
+
+def conditional(*scopes):
+    """Answer If-None-Match from the version counters before running the view.
+
+    Each scope is a name or a function of the view's URL arguments. The weak
+    ETag changes whenever any of the counters does.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            names = [scope(**kwargs) if callable(scope) else scope for scope in scopes]
+            etag = "-".join(str(version) for version in current(names))
+
+            if request.if_none_match.contains_weak(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+        return wrapper
+
+    return decorator
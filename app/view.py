@@ -1,4 +1,5 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
+from app import metrics
 
 main_bp = Blueprint('main', __name__)
 
@@ -11,3 +12,7 @@ def home():
     agent = request.user_agent.string
     return jsonify({"user_agent": agent})
 
+@main_bp.route('/metrics')
+def prometheus_metrics():
+    body, content_type = metrics.render()
+    return Response(body, content_type=content_type)
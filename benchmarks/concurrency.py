@@ -0,0 +1,190 @@
+"""Read and write throughput of the SQLite config profiles under concurrent workers.
+
+Each profile gets a freshly seeded database file. Worker processes (standing
+in for gunicorn workers) then hammer it with writes, reads, or half of each
+for a fixed time, and the totals are compared per profile.
+
+    python benchmarks/concurrency.py --workers 8 --duration 10
+    python benchmarks/concurrency.py --profile baseline --profile prod-sqlite
+"""
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.seed import seed_database  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# What the app ran with before config profiles existed.
+BASELINE = {"SQLALCHEMY_ENGINE_OPTIONS": {}, "SQLITE_PRAGMAS": {}}
+MODES = ("write", "read", "mixed")
+
+
+def _profile_settings(profile):
+    return BASELINE if profile == "baseline" else config.PROFILES[profile]
+
+
+def _make_app(path, profile):
+    settings = _profile_settings(profile)
+
+    class BenchConfig:
+        SECRET_KEY = "benchmark"
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        SQLALCHEMY_ENGINE_OPTIONS = settings["SQLALCHEMY_ENGINE_OPTIONS"]
+        SQLITE_PRAGMAS = settings["SQLITE_PRAGMAS"]
+        REPORT_CACHE_BACKEND = "none"
+        SQL_INSTRUMENTATION = False
+
+    app = create_app(BenchConfig)
+    app.logger.setLevel(logging.CRITICAL)
+    return app
+
+
+def _write(client, rng, users):
+    return client.post("/api/transactions", json={
+        "amount": round(rng.uniform(1, 300), 2),
+        "type": rng.choice(["expense", "revenue"]),
+        "categories": ["groceries"],
+        "user_ids": [rng.randint(1, users)],
+        "description": "concurrency benchmark",
+        "date": (datetime.utcnow() - timedelta(days=rng.randint(0, 365))).strftime("%Y-%m-%d %H:%M:%S")
+    })
+
+
+def _read(client, rng, users):
+    if rng.random() < 0.5:
+        return client.get("/api/transactions?limit=50")
+    month = (datetime.utcnow() - timedelta(days=30 * rng.randint(0, 11))).strftime("%Y-%m")
+    return client.post("/api/reports/monthly_expenses", json={"user_id": rng.randint(1, users), "month": month})
+
+
+def _worker(path, profile, kind, users, start_at, stop_at, seed, results):
+    app = _make_app(path, profile)
+    client = app.test_client()
+    rng = random.Random(seed)
+    operation = _write if kind == "write" else _read
+    latencies = []
+    errors = 0
+    while time.time() < start_at:
+        time.sleep(0.005)
+    while time.time() < stop_at:
+        started = time.perf_counter()
+        response = operation(client, rng, users)
+        if response.status_code >= 500:
+            errors += 1
+        else:
+            latencies.append((time.perf_counter() - started) * 1000)
+    results.put((kind, latencies, errors))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_mode(path, profile, mode, workers, duration, users, seed):
+    kinds = [mode] * workers if mode != "mixed" else ["write", "read"] * (workers // 2) + ["write"] * (workers % 2)
+    results = multiprocessing.Queue()
+    start_at = time.time() + 2
+    processes = [
+        multiprocessing.Process(
+            target=_worker, args=(path, profile, kind, users, start_at, start_at + duration, seed + i, results)
+        )
+        for i, kind in enumerate(kinds)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {}
+    for kind in sorted(set(kinds)):
+        latencies = sorted(value for k, values, _ in collected if k == kind for value in values)
+        summary[kind] = {
+            "workers": kinds.count(kind),
+            "ok": len(latencies),
+            "errors": sum(errors for k, _, errors in collected if k == kind),
+            "throughput_rps": round(len(latencies) / duration, 1),
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3)
+        }
+    return summary
+
+
+def print_results(results):
+    print(f"{'profile':<14} {'mode':<7} {'kind':<6} {'req/s':>9} {'errors':>7} {'p50':>8} {'p95':>8}")
+    for profile, modes in results.items():
+        for mode, kinds in modes.items():
+            for kind, result in kinds.items():
+                print(f"{profile:<14} {mode:<7} {kind:<6} {result['throughput_rps']:>9.1f} {result['errors']:>7} "
+                      f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", action="append", choices=["baseline", "dev", "prod-sqlite"],
+                        help="Profiles to compare (default: baseline, dev and prod-sqlite)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per mode")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--transactions", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Where to write the JSON results (default: benchmarks/results/)")
+    args = parser.parse_args()
+    profiles = args.profile or ["baseline", "dev", "prod-sqlite"]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in profiles:
+            path = os.path.join(tmp, f"{profile}.sqlite")
+            app = _make_app(path, profile)
+            with app.app_context():
+                db.create_all()
+                seed_database(args.users, args.categories, args.transactions, seed=args.seed)
+                db.engine.dispose()
+
+            results[profile] = {
+                mode: run_mode(path, profile, mode, args.workers, args.duration, args.users, args.seed)
+                for mode in MODES
+            }
+
+    print_results(results)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"concurrency-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                **vars(args),
+                "profile": profiles
+            },
+            "results": results
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""Latency, throughput and SQL statement counts for every API route.
+
+Seeds a throwaway SQLite database with `seed_database`, drives each route
+through the Flask test client and writes the results as JSON so runs can be
+compared.
+
+    python benchmarks/endpoints.py --transactions 100000 --iterations 200
+    python benchmarks/endpoints.py --compare benchmarks/results/endpoints-<timestamp>.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.seed import seed_database  # noqa: E402
+from app.transactions.models import ReportJob  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+Scenario = namedtuple("Scenario", "name method url body max_iterations record", defaults=(None, None, None))
+
+
+class Context:
+    def __init__(self, users, categories, transactions):
+        self.users = users
+        self.categories = categories
+        self.transactions = transactions
+        self.created = 0
+        self.deletable_users = list(range(users, 0, -1))
+        self.deletable_categories = list(range(categories, 0, -1))
+        self.deletable_transactions = list(range(transactions, 0, -1))
+        self.report_jobs = []
+        self.cancellable_jobs = []
+
+    def unique(self, prefix):
+        self.created += 1
+        return f"{prefix}{self.created}"
+
+
+def _recent_month(rng):
+    month = datetime.utcnow().replace(day=1) - timedelta(days=30 * rng.randint(0, 11))
+    return month.strftime("%Y-%m")
+
+
+def _queue_sibling_jobs(count):
+    """Queued report jobs owned by another live worker process on this host.
+
+    The parent process stands in for the sibling so the jobs are not failed as
+    orphaned, which gives the cancel endpoint active jobs no matter how fast
+    this process's pool works through its own.
+    """
+    now = datetime.utcnow()
+    jobs = [
+        ReportJob(
+            id=uuid.uuid4().hex,
+            report="daily_expenses",
+            params=json.dumps({"user_id": 1, "type": "expense", "start_date": "2020-01-01", "end_date": "2030-01-01"}),
+            tenant="user:1",
+            status="queued",
+            worker=f"{socket.gethostname()}:{os.getppid()}",
+            created_at=now,
+            expires_at=now + timedelta(hours=1)
+        )
+        for _ in range(count)
+    ]
+    db.session.add_all(jobs)
+    db.session.commit()
+    return [job.id for job in jobs]
+
+
+def _transaction_body(rng, ctx):
+    return {
+        "amount": round(rng.uniform(1, 300), 2),
+        "type": rng.choice(["expense", "revenue"]),
+        "categories": ["groceries", "rent"][:rng.randint(1, 2)],
+        "user_ids": rng.sample(range(1, ctx.users // 2), rng.randint(1, 2)),
+        "description": "benchmark",
+        "date": (datetime.utcnow() - timedelta(days=rng.randint(0, 365))).strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def scenarios(ctx):
+    user = lambda rng: rng.randint(1, ctx.users // 2)  # noqa: E731
+    transaction = lambda rng: rng.randint(1, ctx.transactions // 2)  # noqa: E731
+    category = lambda rng: rng.randint(1, max(1, ctx.categories // 2))  # noqa: E731
+    range_body = lambda rng: {  # noqa: E731
+        "user_id": user(rng),
+        "type": "expense",
+        "start_date": (datetime.utcnow() - timedelta(days=rng.randint(30, 365))).strftime("%Y-%m-%d"),
+        "end_date": datetime.utcnow().strftime("%Y-%m-%d")
+    }
+
+    return [
+        Scenario("GET /api/users", "GET", lambda rng: "/api/users", max_iterations=20),
+        Scenario("GET /api/users/<id>", "GET", lambda rng: f"/api/users/{user(rng)}"),
+        Scenario("GET /api/categories", "GET", lambda rng: "/api/categories"),
+        Scenario("GET /api/categories/<id>", "GET", lambda rng: f"/api/categories/{category(rng)}"),
+        Scenario("GET /api/transactions", "GET", lambda rng: "/api/transactions?limit=100"),
+        Scenario("GET /api/transactions (filtered)", "GET",
+                 lambda rng: f"/api/transactions?limit=100&user_id={user(rng)}&type=expense&min_amount={rng.randint(1, 50)}"
+                             f"&start_date={(datetime.utcnow() - timedelta(days=rng.randint(30, 365))).strftime('%Y-%m-%d')}"
+                             f"&sort={rng.choice(['-date', '-amount'])}"),
+        Scenario("GET /api/transactions/<id>", "GET", lambda rng: f"/api/transactions/{transaction(rng)}"),
+        Scenario("GET /api/users/<id>/transactions/search", "GET",
+                 lambda rng: f"/api/users/{user(rng)}/transactions/search?q={rng.choice(['uber', 'rent march', 'co*'])}&limit=50"),
+        Scenario("GET /api/transactions/export", "GET",
+                 lambda rng: f"/api/transactions/export?user_id={user(rng)}&format={rng.choice(['ndjson', 'csv'])}"),
+        Scenario("POST /api/reports/monthly_expenses", "POST", lambda rng: "/api/reports/monthly_expenses",
+                 lambda rng: {"user_id": user(rng), "month": _recent_month(rng)}),
+        Scenario("POST /api/reports/daily_expenses", "POST", lambda rng: "/api/reports/daily_expenses", range_body),
+        Scenario("POST /api/reports/range_total", "POST", lambda rng: "/api/reports/range_total", range_body),
+        Scenario("POST /api/reports/timeseries", "POST", lambda rng: "/api/reports/timeseries",
+                 lambda rng: dict(zip(["start_month", "end_month"], sorted([_recent_month(rng), _recent_month(rng)])),
+                                  user_id=user(rng), granularity=rng.choice(["day", "week", "month"]))),
+        Scenario("POST /api/reports/monthly_expenses/batch", "POST",
+                 lambda rng: "/api/reports/monthly_expenses/batch",
+                 lambda rng: {"user_ids": "all", "month": _recent_month(rng)}, max_iterations=20),
+        Scenario("GET /api/users/<id>/balance", "GET",
+                 lambda rng: f"/api/users/{user(rng)}/balance" + rng.choice(["", f"?date={_recent_month(rng)}-15"])),
+        Scenario("GET /api/reports/cache_stats", "GET", lambda rng: "/api/reports/cache_stats"),
+        Scenario("POST /api/reports/jobs", "POST", lambda rng: "/api/reports/jobs",
+                 lambda rng: {"report": rng.choice(["daily_expenses", "range_total"]), "params": range_body(rng)},
+                 record=lambda body: ctx.report_jobs.append(body["job_id"])),
+        Scenario("GET /api/reports/jobs/<id>", "GET", lambda rng: f"/api/reports/jobs/{rng.choice(ctx.report_jobs)}"),
+        Scenario("DELETE /api/reports/jobs/<id>", "DELETE",
+                 lambda rng: f"/api/reports/jobs/{ctx.cancellable_jobs.pop()}"),
+        Scenario("POST /api/users/<id>/verify_password", "POST", lambda rng: f"/api/users/{user(rng)}/verify_password",
+                 lambda rng: {"password": rng.choice(["password", "wrong password"])}, max_iterations=20),
+        Scenario("POST /api/users", "POST", lambda rng: "/api/users",
+                 lambda rng: {"username": ctx.unique("bench"), "email": ctx.unique("bench") + "@example.com",
+                              "password": "password"}, max_iterations=20),
+        Scenario("POST /api/users/bulk", "POST", lambda rng: "/api/users/bulk",
+                 lambda rng: {"users": [
+                     {"username": name, "email": f"{name}@example.com", "password": "password"}
+                     for name in (ctx.unique("bench-bulk-") for _ in range(20))
+                 ]}, max_iterations=5),
+        Scenario("PUT /api/users/<id>", "PUT", lambda rng: f"/api/users/{user(rng)}",
+                 lambda rng: {"about_me": "updated by benchmark"}),
+        Scenario("POST /api/categories", "POST", lambda rng: "/api/categories",
+                 lambda rng: {"name": ctx.unique("bench-category-")}),
+        Scenario("PUT /api/categories/<id>", "PUT", lambda rng: f"/api/categories/{ctx.categories // 2 + category(rng)}",
+                 lambda rng: {"name": ctx.unique("renamed-")}),
+        Scenario("POST /api/transactions", "POST", lambda rng: "/api/transactions", lambda rng: _transaction_body(rng, ctx)),
+        Scenario("POST /api/transactions/bulk", "POST", lambda rng: "/api/transactions/bulk",
+                 lambda rng: {"transactions": [_transaction_body(rng, ctx) for _ in range(1000)]}, max_iterations=10),
+        Scenario("PUT /api/transactions/<id>", "PUT", lambda rng: f"/api/transactions/{transaction(rng)}",
+                 lambda rng: {"amount": round(rng.uniform(1, 300), 2)}),
+        Scenario("DELETE /api/transactions/<id>", "DELETE",
+                 lambda rng: f"/api/transactions/{ctx.deletable_transactions.pop()}"),
+        Scenario("DELETE /api/categories/<id>", "DELETE",
+                 lambda rng: f"/api/categories/{ctx.deletable_categories.pop()}", max_iterations=5),
+        Scenario("DELETE /api/users/<id>", "DELETE", lambda rng: f"/api/users/{ctx.deletable_users.pop()}"),
+    ]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(client, scenario, iterations, rng, statements):
+    iterations = min(iterations, scenario.max_iterations or iterations)
+    latencies = []
+    sql_counts = []
+    statuses = Counter()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        url = scenario.url(rng)
+        body = scenario.body(rng) if scenario.body else None
+        statements[0] = 0
+        request_started = time.perf_counter()
+        response = client.open(url, method=scenario.method, json=body)
+        response.get_data()
+        latencies.append((time.perf_counter() - request_started) * 1000)
+        if scenario.record and response.status_code < 400:
+            scenario.record(response.get_json())
+        response.close()
+        sql_counts.append(statements[0])
+        statuses[response.status_code] += 1
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": iterations,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "throughput_rps": round(iterations / elapsed, 1),
+        "sql_per_request": round(sum(sql_counts) / len(sql_counts), 2),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())}
+    }
+
+
+def print_results(results, baseline=None):
+    header = f"{'route':<45} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'sql':>6}"
+    if baseline:
+        header += f" {'p50 Δ':>8}"
+    print(header)
+    for name, result in results.items():
+        line = (f"{name:<45} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{result['throughput_rps']:>8.1f} {result['sql_per_request']:>6.1f}")
+        previous = (baseline or {}).get(name)
+        if previous and previous["p50_ms"]:
+            line += f" {(result['p50_ms'] / previous['p50_ms'] - 1) * 100:>+7.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=30)
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=200, help="Requests per route (some routes are capped lower)")
+    parser.add_argument("--only", action="append", default=[], help="Only run routes containing this text")
+    parser.add_argument("--report-cache", default="memory", choices=["memory", "sqlite", "none"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Where to write the JSON results (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Earlier JSON results to compare p50 latency against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig:
+            SECRET_KEY = "benchmark"
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'bench.sqlite')}"
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            REPORT_CACHE_BACKEND = args.report_cache
+            REPORT_CACHE_PATH = os.path.join(tmp, "report_cache.sqlite")
+            # Job admission is not what is measured; keep every submission accepted.
+            REPORT_JOB_QUEUE_LIMIT = REPORT_JOBS_PER_TENANT = args.iterations * 2
+
+        app = create_app(BenchConfig)
+        statements = [0]
+        with app.app_context():
+            db.create_all()
+            seeding_started = time.perf_counter()
+            seed_database(args.users, args.categories, args.transactions, seed=args.seed)
+            seed_seconds = time.perf_counter() - seeding_started
+            ctx = Context(args.users, args.categories, args.transactions)
+            ctx.cancellable_jobs = _queue_sibling_jobs(args.iterations)
+
+            # Report jobs run on pool threads; only the requests' own statements count.
+            @event.listens_for(db.engine, "before_cursor_execute")
+            def count_statement(*_):
+                if threading.current_thread() is threading.main_thread():
+                    statements[0] += 1
+
+        rng = random.Random(args.seed)
+        client = app.test_client()
+        results = {}
+        for scenario in scenarios(ctx):
+            if args.only and not any(text in scenario.name for text in args.only):
+                continue
+            results[scenario.name] = run_scenario(client, scenario, args.iterations, rng, statements)
+
+        with app.app_context():
+            db.engine.dispose()
+
+    print_results(results, baseline)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"endpoints-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed_seconds": round(seed_seconds, 2),
+                **vars(args)
+            },
+            "results": results
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
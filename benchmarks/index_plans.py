@@ -0,0 +1,139 @@
+"""Before/after query plans and timings for the report and association indexes.
+
+Seeds a throwaway SQLite database, runs the report query shapes without the
+indexes added in migration 5c1e8a7d2f40, then creates them and runs again.
+
+    python benchmarks/index_plans.py --transactions 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select, text  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.categories.models import Category, transaction_categories  # noqa: E402
+from app.transactions.models import Transaction, user_transaction  # noqa: E402
+from app.seed import seed_database  # noqa: E402
+
+NEW_INDEXES = [
+    "ix_transactions_date",
+    "ix_transactions_type_date_amount",
+    "ix_user_transaction_transaction_id",
+    "ix_transaction_categories_category_id",
+]
+
+
+def report_queries(user_id, category_id):
+    month_start = (datetime.utcnow().replace(day=1) - timedelta(days=150)).replace(day=1)
+    month_end = (month_start + timedelta(days=31)).replace(day=1) - timedelta(microseconds=1)
+    return {
+        "monthly_expenses": select(
+            Category.name, func.sum(Transaction.amount)
+        ).join(
+            transaction_categories, Transaction.id == transaction_categories.c.transaction_id
+        ).join(
+            Category, Category.id == transaction_categories.c.category_id
+        ).join(
+            user_transaction, Transaction.id == user_transaction.c.transaction_id
+        ).where(
+            Transaction.date >= month_start,
+            Transaction.date <= month_end,
+            user_transaction.c.user_id == user_id,
+            Transaction.type == "expense"
+        ).group_by(Category.name),
+        "daily_expenses": select(
+            func.date(Transaction.date), func.sum(Transaction.amount)
+        ).join(
+            user_transaction, Transaction.id == user_transaction.c.transaction_id
+        ).where(
+            Transaction.type == "expense",
+            Transaction.date >= month_start,
+            Transaction.date <= month_end,
+            user_transaction.c.user_id == user_id
+        ).group_by(func.date(Transaction.date)),
+        "month_all_users": select(
+            Transaction.type, func.sum(Transaction.amount)
+        ).where(
+            Transaction.type == "expense",
+            Transaction.date >= month_start,
+            Transaction.date <= month_end
+        ).group_by(Transaction.type),
+        "transactions_page": select(Transaction.id).order_by(
+            Transaction.date.desc(), Transaction.id.desc()
+        ).limit(100),
+        "users_of_transaction": select(user_transaction.c.user_id).where(
+            user_transaction.c.transaction_id == 1000
+        ),
+        "transactions_of_category": select(func.count()).select_from(transaction_categories).where(
+            transaction_categories.c.category_id == category_id
+        ),
+    }
+
+
+def measure(queries, repeat):
+    results = {}
+    with db.engine.connect() as conn:
+        for name, query in queries.items():
+            sql = str(query.compile(db.engine, compile_kwargs={"literal_binds": True}))
+            plan = [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+            started = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(query).fetchall()
+            elapsed_ms = (time.perf_counter() - started) / repeat * 1000
+            results[name] = (plan, elapsed_ms)
+    return results
+
+
+def print_results(label, results):
+    print(f"== {label}")
+    for name, (plan, elapsed_ms) in results.items():
+        print(f"{name}: {elapsed_ms:.2f} ms")
+        for step in plan:
+            print(f"    {step}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=30)
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'bench.sqlite')}"
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            with db.engine.begin() as conn:
+                for index in NEW_INDEXES:
+                    conn.execute(text(f"DROP INDEX {index}"))
+
+            seed_database(args.users, args.categories, args.transactions, months=36, seed=42)
+            queries = report_queries(user_id=1, category_id=1)
+
+            with db.engine.begin() as conn:
+                conn.execute(text("ANALYZE"))
+            print_results("before", measure(queries, args.repeat))
+
+            tables = [Transaction.__table__, user_transaction, transaction_categories]
+            with db.engine.begin() as conn:
+                for table in tables:
+                    for index in table.indexes:
+                        if index.name in NEW_INDEXES:
+                            index.create(conn)
+                conn.execute(text("ANALYZE"))
+            print_results("after", measure(queries, args.repeat))
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Import time, create_app time and time to first request, in fresh processes.
+
+Every run is a new interpreter, like a gunicorn worker boot or a `flask db`
+invocation. --eager-swagger also builds flasgger's Swagger(app) the way
+create_app used to, for comparison with the precompiled spec.
+
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --runs 10 --eager-swagger
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+from app import create_app
+imported = time.perf_counter()
+
+class StartupConfig:
+    SECRET_KEY = "startup"
+    SQLALCHEMY_DATABASE_URI = {database!r}
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+app = create_app(StartupConfig)
+if {eager_swagger!r}:
+    from flasgger import Swagger
+    Swagger(app)
+created = time.perf_counter()
+
+response = app.test_client().get("/")
+first_request = time.perf_counter()
+assert response.status_code == 200, response.status_code
+
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (first_request - created) * 1000,
+    "total_ms": (first_request - started) * 1000,
+    "flasgger_imported": "flasgger" in sys.modules
+}}))
+"""
+
+
+def run_once(database, eager_swagger):
+    code = CHILD.format(root=ROOT, database=database, eager_swagger=eager_swagger)
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--eager-swagger", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = f"sqlite:///{os.path.join(tmp, 'startup.sqlite')}"
+        runs = [run_once(database, args.eager_swagger) for _ in range(args.runs)]
+
+    print(f"{'phase':<18} {'median':>9} {'min':>9} {'max':>9}")
+    for phase in ("import_ms", "create_app_ms", "first_request_ms", "total_ms"):
+        values = [run[phase] for run in runs]
+        print(f"{phase:<18} {statistics.median(values):>9.1f} {min(values):>9.1f} {max(values):>9.1f}")
+    print(f"flasgger imported: {runs[0]['flasgger_imported']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,93 @@
+import os
+
 SECRET_KEY = "secret-tsh"
 SQLALCHEMY_DATABASE_URI = 'sqlite:///data.sqlite'
-SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+# Report response cache: "memory" (per worker process), "sqlite" (one file
+# under instance/ shared by every worker on the host) or "none". Memory
+# entries are checked against the data_versions counters on every lookup,
+# so writes made through another worker are not served stale.
+REPORT_CACHE_BACKEND = "memory"
+REPORT_CACHE_MAX_ENTRIES = 1024
+
+# Per-request SQL statement counts and timings in the Server-Timing header,
+# plus a structured "app.slow" log for requests and queries over the limits.
+SQL_INSTRUMENTATION = True
+SLOW_REQUEST_MS = 500
+SLOW_QUERY_MS = 100
+# Bound parameters can hold password hashes and emails; only log them when debugging.
+SLOW_LOG_PARAMS = False
+
+
+# Prometheus metrics at /metrics. Under gunicorn, gunicorn.conf.py points
+# PROMETHEUS_MULTIPROC_DIR at instance/prometheus so every worker is counted.
+METRICS_ENABLED = True
+
+# On-demand cProfile of single API requests: send the token in the
+# X-Profile-Token header and the .pstats file lands in instance/profiles/
+# (oldest removed beyond PROFILING_MAX_FILES). Views are untouched when off.
+PROFILING_ENABLED = False
+PROFILING_TOKEN = None
+PROFILING_MAX_FILES = 100
+
+# Read replica for the list, get-by-id and report views: add a "replica" bind,
+# e.g. SQLALCHEMY_BINDS = {"replica": "sqlite:///data-replica.sqlite"}. A SQLite
+# replica is refreshed from the primary with the backup API every
+# REPLICA_REFRESH_SECONDS (or `flask replica refresh`). Clients that wrote in
+# the last REPLICA_STICKY_SECONDS keep reading from the primary.
+SQLALCHEMY_BINDS = {}
+REPLICA_REFRESH_SECONDS = 5
+REPLICA_STICKY_SECONDS = 10
+
+# Background report jobs (POST /api/reports/jobs): threads per worker process,
+# active jobs allowed in total and per user, and how long results are kept.
+REPORT_JOB_WORKERS = 2
+REPORT_JOB_QUEUE_LIMIT = 20
+REPORT_JOBS_PER_TENANT = 2
+REPORT_JOB_TTL_SECONDS = 3600
+
+# Password hashing runs on a per-worker process pool. BCRYPT_LOG_ROUNDS is the
+# bcrypt cost; stored hashes with another cost are upgraded on next login.
+# Past PASSWORD_HASH_MAX_PENDING queued hashes, requests get a 503.
+BCRYPT_LOG_ROUNDS = 12
+PASSWORD_HASH_WORKERS = 2
+PASSWORD_HASH_MAX_PENDING = 16
+PASSWORD_HASH_TIMEOUT_SECONDS = 10
+# Processes for bulk imports (POST /api/users/bulk, `flask users import`);
+# None uses every CPU.
+PASSWORD_HASH_BULK_WORKERS = None
+
+# Engine profiles, picked with the CONFIG_PROFILE environment variable.
+# SQLITE_PRAGMAS are run on every new SQLite connection.
+#   dev            - single process, default journal.
+#   prod-sqlite    - several gunicorn workers sharing one SQLite file: WAL so
+#                    readers don't block the writer, NORMAL sync (durable
+#                    across app crashes, not power loss), larger page cache.
+# Only SQLite is supported: the rollups, timeseries buckets, search (FTS5) and
+# bulk id reservation rely on it, and create_app refuses any other database.
+PROFILES = {
+    "dev": {
+        "SQLALCHEMY_ENGINE_OPTIONS": {},
+        "SQLITE_PRAGMAS": {"busy_timeout": 5000}
+    },
+    "prod-sqlite": {
+        "SQLALCHEMY_ENGINE_OPTIONS": {
+            "pool_size": 5,
+            "max_overflow": 10,
+            "pool_recycle": 3600,
+            "pool_pre_ping": True
+        },
+        "SQLITE_PRAGMAS": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,
+            "cache_size": -64000,
+            "mmap_size": 268435456
+        }
+    }
+}
+CONFIG_PROFILE = os.environ.get("CONFIG_PROFILE", "dev")
+if CONFIG_PROFILE not in PROFILES:
+    raise ValueError(f"Unknown CONFIG_PROFILE: {CONFIG_PROFILE!r}")
+globals().update(PROFILES[CONFIG_PROFILE])
\ No newline at end of file
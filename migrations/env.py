@@ -90,9 +90,17 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # the FTS5 search table and its shadow tables are created by hand in
+    # migrations, so autogenerate must not propose dropping them
+    def include_object(object, name, type_, reflected, compare_to):
+        return not (type_ == "table" and reflected and compare_to is None
+                    and name.startswith("transaction_search"))
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
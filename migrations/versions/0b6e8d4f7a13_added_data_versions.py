@@ -0,0 +1,28 @@
+"""Added data version counters
+
+Revision ID: 0b6e8d4f7a13
+Revises: f3d9a6c1b852
+Create Date: 2026-10-17 11:02:44.183529
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6e8d4f7a13'
+down_revision = 'f3d9a6c1b852'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('data_versions',
+    sa.Column('scope', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade():
+    op.drop_table('data_versions')
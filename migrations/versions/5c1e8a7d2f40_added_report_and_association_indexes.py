@@ -0,0 +1,40 @@
+"""Added report and association indexes
+
+Revision ID: 5c1e8a7d2f40
+Revises: d655bba8f562
+Create Date: 2026-10-16 10:12:31.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e8a7d2f40'
+down_revision = 'd655bba8f562'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_date', ['date'], unique=False)
+        batch_op.create_index('ix_transactions_type_date_amount', ['type', 'date', 'amount'], unique=False)
+
+    with op.batch_alter_table('user_transaction', schema=None) as batch_op:
+        batch_op.create_index('ix_user_transaction_transaction_id', ['transaction_id', 'user_id'], unique=False)
+
+    with op.batch_alter_table('transaction_categories', schema=None) as batch_op:
+        batch_op.create_index('ix_transaction_categories_category_id', ['category_id', 'transaction_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transaction_categories', schema=None) as batch_op:
+        batch_op.drop_index('ix_transaction_categories_category_id')
+
+    with op.batch_alter_table('user_transaction', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_transaction_transaction_id')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_type_date_amount')
+        batch_op.drop_index('ix_transactions_date')
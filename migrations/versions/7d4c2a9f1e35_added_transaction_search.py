@@ -0,0 +1,29 @@
+"""Added transaction search
+
+Revision ID: 7d4c2a9f1e35
+Revises: 0b6e8d4f7a13
+Create Date: 2026-10-17 14:26:09.571302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d4c2a9f1e35'
+down_revision = '0b6e8d4f7a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Kept in sync by app.transactions.search_index from the write paths, not triggers.
+    op.execute("CREATE VIRTUAL TABLE transaction_search USING fts5(description, user_ids)")
+    op.execute("""INSERT INTO transaction_search(rowid, description, user_ids)
+        SELECT t.id, coalesce(t.description, ''), group_concat('u' || ut.user_id, ' ')
+        FROM transactions t JOIN user_transaction ut ON ut.transaction_id = t.id
+        GROUP BY t.id""")
+
+
+def downgrade():
+    op.execute("DROP TABLE transaction_search")
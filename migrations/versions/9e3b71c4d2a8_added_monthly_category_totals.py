@@ -0,0 +1,41 @@
+"""Added monthly category totals rollup
+
+Revision ID: 9e3b71c4d2a8
+Revises: 5c1e8a7d2f40
+Create Date: 2026-10-16 11:40:08.517390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e3b71c4d2a8'
+down_revision = '5c1e8a7d2f40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('monthly_category_totals',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.String(length=7), nullable=False),
+    sa.Column('type', sa.Enum('expense', 'revenue', name='transaction_type'), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'month', 'type', 'category_id')
+    )
+    op.execute("""INSERT INTO monthly_category_totals (user_id, month, type, category_id, total_amount, transaction_count)
+        SELECT ut.user_id, strftime('%Y-%m', t.date), t.type, tc.category_id, sum(t.amount), count(*)
+        FROM transactions t
+        JOIN user_transaction ut ON ut.transaction_id = t.id
+        JOIN transaction_categories tc ON tc.transaction_id = t.id
+        WHERE t.date IS NOT NULL
+        GROUP BY ut.user_id, strftime('%Y-%m', t.date), t.type, tc.category_id""")
+
+
+def downgrade():
+    op.drop_table('monthly_category_totals')
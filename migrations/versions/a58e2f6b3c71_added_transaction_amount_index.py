@@ -0,0 +1,26 @@
+"""Added transaction amount index
+
+Revision ID: a58e2f6b3c71
+Revises: 7d4c2a9f1e35
+Create Date: 2026-10-17 16:41:52.218064
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a58e2f6b3c71'
+down_revision = '7d4c2a9f1e35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_amount', ['amount'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_amount')
@@ -0,0 +1,42 @@
+"""Added daily totals aggregate
+
+Revision ID: c47d0f95b6e1
+Revises: 9e3b71c4d2a8
+Create Date: 2026-10-16 13:05:52.118604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47d0f95b6e1'
+down_revision = '9e3b71c4d2a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_totals',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.Enum('expense', 'revenue', name='transaction_type'), nullable=False),
+    sa.Column('day', sa.String(length=10), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('cumulative_amount', sa.Float(), nullable=False),
+    sa.Column('cumulative_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'type', 'day')
+    )
+    op.execute("""INSERT INTO daily_totals (user_id, type, day, total_amount, transaction_count, cumulative_amount, cumulative_count)
+        SELECT ut.user_id, t.type, date(t.date), sum(t.amount), count(*),
+            sum(sum(t.amount)) OVER (PARTITION BY ut.user_id, t.type ORDER BY date(t.date)),
+            sum(count(*)) OVER (PARTITION BY ut.user_id, t.type ORDER BY date(t.date))
+        FROM transactions t
+        JOIN user_transaction ut ON ut.transaction_id = t.id
+        WHERE t.date IS NOT NULL
+        GROUP BY ut.user_id, t.type, date(t.date)""")
+
+
+def downgrade():
+    op.drop_table('daily_totals')